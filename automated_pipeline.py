@@ -10,30 +10,32 @@ import asyncio
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
 # Import from refactored modules
 from youtube_transcript_downloader import (
     CREATORS,
-    get_channel_videos,
+    iter_channel_video_pages,
     download_video_audio,
     generate_transcript_with_chunking,
-    save_transcript_json,
-    create_readable_transcript,
+    build_transcript_record,
+    write_transcript_artifacts,
     cleanup_audio_file,
     create_openai_client,
     VideoMetadata
 )
 from add_transcripts_to_rag import (
-    process_transcript_file
+    process_transcript_data_async,
+    close_async_http_client
 )
 from video_tracker import (
     initialize_database,
-    is_video_processed,
-    mark_video_processed,
-    mark_rag_integrated,
+    get_processed_ids,
+    try_claim_video,
+    release_video_claim,
+    mark_videos_processed,
     update_channel_check,
     log_processing_error,
     get_processing_stats,
@@ -56,6 +58,22 @@ OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "music_tutorials"))
 RAG_API_URL = os.getenv("RAG_API_URL", "http://localhost:8000")
 CHECK_INTERVAL_MINUTES = int(os.getenv("CHECK_INTERVAL_MINUTES", "60"))
 MAX_VIDEOS_PER_CHECK = int(os.getenv("MAX_VIDEOS_PER_CHECK", "5"))
+DOWNLOAD_CONCURRENCY = int(os.getenv("DOWNLOAD_CONCURRENCY", "3"))
+CREATOR_CONCURRENCY = int(os.getenv("CREATOR_CONCURRENCY", "4"))
+TRANSCRIBE_CONCURRENCY = int(os.getenv("TRANSCRIBE_CONCURRENCY", "2"))
+WRITE_READABLE = os.getenv("WRITE_READABLE", "0") == "1"  # Also write *_readable.txt transcripts
+
+# Limits how many creators are checked at once to respect YouTube rate limits
+CREATOR_SEMAPHORE = asyncio.Semaphore(CREATOR_CONCURRENCY)
+# Per-stage limits: videos move through download and transcription independently,
+# so one video can download while another is transcribed and a third uploads to RAG
+DOWNLOAD_SEMAPHORE = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+# Limits concurrent Whisper transcriptions to stay under OpenAI rate limits
+TRANSCRIBE_SEMAPHORE = asyncio.Semaphore(TRANSCRIBE_CONCURRENCY)
+
+# Global state
+# Creator directories already created this process, to skip repeated mkdir calls
+_ensured_dirs: Set[Path] = set()
 
 
 # Pydantic Models
@@ -67,42 +85,37 @@ class PipelineRunSummary(BaseModel):
 
 
 # Video filtering utilities
-def filter_new_videos(
-    videos: List[VideoMetadata],
+def collect_new_videos(
+    creator_url: str,
     max_videos: int,
     db_path: str = "video_tracker.db"
 ) -> List[VideoMetadata]:
-    """Filter out already processed videos."""
+    """Page through a channel listing until enough unprocessed videos are found."""
     new_videos = []
 
-    for video in videos:
-        if not is_video_processed(video.id, db_path):
-            new_videos.append(video)
+    for page in iter_channel_video_pages(creator_url):
+        # One tracker lookup per page of candidates
+        processed_ids = get_processed_ids([video.id for video in page], db_path)
+        new_videos.extend(video for video in page if video.id not in processed_ids)
 
         if len(new_videos) >= max_videos:
             break
 
-    return new_videos
+    return new_videos[:max_videos]
 
 
-def get_new_videos_for_creator(
+async def fetch_new_creator_videos(
     creator_name: str,
     creator_url: str,
     max_videos: int
 ) -> List[VideoMetadata]:
-    """Check for new videos not in tracker DB."""
+    """Fetch videos for a creator that are not yet in the tracker DB."""
     print(f"\n{'='*80}")
     print(f"Checking for new videos: {creator_name}")
     print(f"{'='*80}")
 
-    # Get recent videos from YouTube
-    videos = get_channel_videos(creator_url, max_videos * 2)
-
-    # Filter out already processed videos
-    new_videos = filter_new_videos(videos, max_videos)
-
-    print(f"Found {len(new_videos)} new video(s)")
-    return new_videos
+    async with CREATOR_SEMAPHORE:
+        return await asyncio.to_thread(collect_new_videos, creator_url, max_videos)
 
 
 # Video processing workflow
@@ -112,67 +125,79 @@ async def process_new_video(
     output_dir: Path,
     openai_client,
     rag_api_url: str
-) -> bool:
-    """Download, transcribe, and add to RAG."""
+) -> Optional[VideoRecord]:
+    """Download, transcribe, and add to RAG. Returns the tracker record on success."""
+    # Reserve the video so concurrent workers or runs don't process it twice
+    if not try_claim_video(video.id, creator_name, video.title):
+        print(f"\nSkipping (already processed or in progress): {video.title}")
+        return None
+
     print(f"\nProcessing: {video.title}")
 
     try:
         # Create creator directory
         creator_dir = output_dir / creator_name.replace(" ", "_")
-        creator_dir.mkdir(exist_ok=True, parents=True)
+        if creator_dir not in _ensured_dirs:
+            creator_dir.mkdir(exist_ok=True, parents=True)
+            _ensured_dirs.add(creator_dir)
 
         # Download video
-        downloaded_info = download_video_audio(video.url, creator_dir)
+        async with DOWNLOAD_SEMAPHORE:
+            downloaded_info = await asyncio.to_thread(download_video_audio, video.url, creator_dir)
         if not downloaded_info:
             raise Exception("Failed to download video")
 
         # Generate transcript (with automatic chunking for large files)
-        transcript = generate_transcript_with_chunking(
-            downloaded_info.audio_file,
-            downloaded_info.title,
-            openai_client
-        )
+        async with TRANSCRIBE_SEMAPHORE:
+            transcript = await asyncio.to_thread(
+                generate_transcript_with_chunking,
+                downloaded_info.audio_file,
+                downloaded_info.title,
+                openai_client,
+                downloaded_info.duration
+            )
         if not transcript:
             raise Exception("Failed to generate transcript")
 
-        # Save transcript
-        transcript_path = save_transcript_json(
-            transcript,
-            downloaded_info,
-            creator_dir
+        # Start the RAG upload straight from memory while the transcript files are written
+        transcript_data = build_transcript_record(transcript, downloaded_info)
+        upload_task = asyncio.create_task(
+            process_transcript_data_async(transcript_data, creator_name, rag_api_url)
         )
 
-        # Create readable version
-        create_readable_transcript(
-            transcript,
-            downloaded_info,
-            creator_dir
-        )
+        # Save transcript (nothing downstream reads the readable version, so it's opt-in)
+        try:
+            transcript_path = await asyncio.to_thread(
+                write_transcript_artifacts,
+                transcript,
+                downloaded_info,
+                creator_dir,
+                WRITE_READABLE
+            )
+        except BaseException:
+            # Stop uploading segments for a video that is about to be recorded as failed
+            upload_task.cancel()
+            await asyncio.gather(upload_task, return_exceptions=True)
+            raise
 
-        # Mark as processed in tracker
+        # Wait for the RAG upload to finish
+        segments_added = await upload_task
+
+        # Tracker record, written in one batch per creator by process_creator
         video_record = VideoRecord(
             video_id=downloaded_info.video_id,
             channel_name=creator_name,
             video_title=downloaded_info.title,
             upload_date=downloaded_info.upload_date or '',
             transcript_path=transcript_path,
-            rag_integrated=False
+            rag_integrated=segments_added > 0
         )
-        mark_video_processed(video_record)
-
-        # Add to RAG system
-        transcript_file = Path(transcript_path)
-        if transcript_file.exists():
-            segments_added = process_transcript_file(transcript_file, rag_api_url)
-
-            if segments_added > 0:
-                mark_rag_integrated(downloaded_info.video_id)
 
         # Clean up audio file
         cleanup_audio_file(downloaded_info.audio_file)
 
         # Send notification
-        notify_new_video(VideoInfo(
+        await asyncio.to_thread(notify_new_video, VideoInfo(
             creator=creator_name,
             title=downloaded_info.title,
             id=downloaded_info.video_id,
@@ -181,12 +206,15 @@ async def process_new_video(
         ))
 
         print(f"✅ Successfully processed: {downloaded_info.title}")
-        return True
+        return video_record
 
     except Exception as e:
         error_msg = str(e)
         print(f"❌ Error processing video: {error_msg}")
 
+        # Release the claim so the video is retried on the next run
+        release_video_claim(video.id)
+
         # Log error
         log_processing_error(
             video_id=video.id,
@@ -195,49 +223,47 @@ async def process_new_video(
         )
 
         # Send error notification
-        notify_error(ErrorInfo(
+        await asyncio.to_thread(notify_error, ErrorInfo(
             creator=creator_name,
             video_title=video.title,
             video_id=video.id,
             error=error_msg
         ))
 
-        return False
+        return None
 
 
 # Creator processing
 async def process_creator(
     creator_name: str,
-    creator_info: Dict[str, str],
+    new_videos: List[VideoMetadata],
     output_dir: Path,
     openai_client,
-    rag_api_url: str,
-    max_videos: int
+    rag_api_url: str
 ) -> int:
     """Process new videos for a single creator."""
     try:
-        # Get new videos
-        new_videos = get_new_videos_for_creator(
-            creator_name,
-            creator_info['url'],
-            max_videos
-        )
+        print(f"{creator_name}: found {len(new_videos)} new video(s)")
 
         if not new_videos:
             return 0
 
-        # Process each new video
-        processed_count = 0
-        for video in new_videos:
-            success = await process_new_video(
+        # Process new videos concurrently (each stage bounded by its own semaphore)
+        results = await asyncio.gather(*[
+            process_new_video(
                 video,
                 creator_name,
                 output_dir,
                 openai_client,
                 rag_api_url
             )
-            if success:
-                processed_count += 1
+            for video in new_videos
+        ])
+        video_records = [record for record in results if record]
+
+        # Mark all processed videos in one tracker transaction
+        mark_videos_processed(video_records)
+        processed_count = len(video_records)
 
         # Update channel check time
         last_video_id = new_videos[0].id if new_videos else None
@@ -268,19 +294,32 @@ async def run_pipeline_once(
 
     openai_client = create_openai_client(openai_api_key)
 
-    total_new_videos = 0
-    total_processed = 0
-
-    for creator_name, creator_info in creators.items():
-        processed = await process_creator(
-            creator_name,
-            creator_info,
-            output_dir,
-            openai_client,
-            rag_api_url,
-            max_videos_per_check
-        )
-        total_processed += processed
+    try:
+        # Fetch new videos for all creators concurrently (bounded by CREATOR_SEMAPHORE)
+        listings = await asyncio.gather(*[
+            fetch_new_creator_videos(creator_name, creator_info['url'], max_videos_per_check)
+            for creator_name, creator_info in creators.items()
+        ])
+        new_videos_by_creator = dict(zip(creators.keys(), listings))
+        total_new_videos = sum(len(videos) for videos in new_videos_by_creator.values())
+
+        results = await asyncio.gather(*[
+            process_creator(
+                creator_name,
+                new_videos,
+                output_dir,
+                openai_client,
+                rag_api_url
+            )
+            for creator_name, new_videos in new_videos_by_creator.items()
+        ])
+        total_processed = sum(results)
+
+    finally:
+        # Release pooled Whisper and RAG API connections until the next run;
+        # the Whisper pool is ours, so the SDK won't close it
+        openai_client.close()
+        await close_async_http_client()
 
     completed_at = datetime.now()
 
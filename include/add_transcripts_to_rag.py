@@ -5,12 +5,20 @@ Processes transcript files and adds them to the Milvus vector database for seman
 """
 
 import os
-import json
-import subprocess
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
+import aiofiles
+import aiofiles.os
+import av
+import httpx
+import orjson
 import requests
-from openai import OpenAI
+import zstandard as zstd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
@@ -23,6 +31,54 @@ OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "music_tutorials"))
 # Use 'api' hostname when running in Docker, localhost otherwise
 RAG_API_URL = os.getenv("RAG_API_URL", "http://api:8000" if os.path.exists("/.dockerenv") else "http://localhost:8000")
 MAX_CHUNK_DURATION = 25 * 60  # 25 minutes in seconds (Whisper API limit)
+RAG_BATCH_SIZE = int(os.getenv("RAG_BATCH_SIZE", "100"))  # Segments per /api/add-documents request
+RAG_UPLOAD_WORKERS = int(os.getenv("RAG_UPLOAD_WORKERS", "4"))  # Concurrent requests to the RAG API
+WHISPER_CONCURRENCY = int(os.getenv("WHISPER_CONCURRENCY", "4"))  # Concurrent Whisper requests (rate limits)
+WHISPER_TIMEOUT_SECONDS = float(os.getenv("WHISPER_TIMEOUT_SECONDS", "600"))  # Per-request timeout for audio uploads
+
+
+def create_http_session(pool_size: int = 32) -> requests.Session:
+    """Create an HTTP session with connection pooling and retries for transient errors."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["POST"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session so repeated RAG uploads reuse TCP connections
+_SESSION = create_http_session()
+
+# Global state
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client, creating it on first use."""
+    global _async_http_client
+
+    if _async_http_client is None or _async_http_client.is_closed:
+        _async_http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=120,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=64)
+        )
+    return _async_http_client
+
+
+async def close_async_http_client() -> None:
+    """Close the shared async HTTP client if it was opened."""
+    global _async_http_client
+
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
 
 
 # Pydantic Models
@@ -37,64 +93,106 @@ class IntegrationSummary(BaseModel):
 
 
 # File utilities
+TRANSCRIPT_SUFFIX = "_transcript.json"
+COMPRESSED_TRANSCRIPT_SUFFIX = "_transcript.json.zst"
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".webm")  # Formats the downloader can leave behind, in order of preference
+ZSTD_LEVEL = 3
+
+
+def iter_creator_dirs(output_dir: Path) -> List[Path]:
+    """List creator directories using cached DirEntry type info."""
+    with os.scandir(output_dir) as entries:
+        return [Path(entry.path) for entry in entries if entry.is_dir()]
+
+
+def scan_transcripts(transcripts_dir: Path) -> Dict[str, Path]:
+    """Map video IDs to their transcript file, preferring compressed transcripts."""
+    transcripts = {}
+
+    try:
+        with os.scandir(transcripts_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(COMPRESSED_TRANSCRIPT_SUFFIX) and entry.is_file():
+                    transcripts[entry.name[:-len(COMPRESSED_TRANSCRIPT_SUFFIX)]] = Path(entry.path)
+                elif entry.name.endswith(TRANSCRIPT_SUFFIX) and entry.is_file():
+                    transcripts.setdefault(entry.name[:-len(TRANSCRIPT_SUFFIX)], Path(entry.path))
+    except FileNotFoundError:
+        pass
+
+    return transcripts
+
+
+def load_transcript_file(transcript_file: Path) -> Dict:
+    """Read a transcript file, decompressing .json.zst transcripts."""
+    with open(transcript_file, 'rb') as f:
+        if transcript_file.name.endswith('.zst'):
+            with zstd.ZstdDecompressor().stream_reader(f) as reader:
+                return orjson.loads(reader.read())
+        return orjson.loads(f.read())
+
+
 def find_transcript_files(output_dir: Path) -> List[Path]:
     """Scan directories for transcript JSON files."""
     transcript_files = []
 
-    for creator_dir in output_dir.iterdir():
-        if not creator_dir.is_dir():
-            continue
+    for creator_dir in iter_creator_dirs(output_dir):
+        transcripts = scan_transcripts(creator_dir / "transcripts")
 
-        transcripts_dir = creator_dir / "transcripts"
-        if not transcripts_dir.exists():
-            continue
-
-        for file in transcripts_dir.glob("*_transcript.json"):
-            transcript_files.append(file)
+        for stem in sorted(transcripts):
+            transcript_files.append(transcripts[stem])
 
     return transcript_files
 
 
 def find_unprocessed_audio_files(output_dir: Path) -> List[Path]:
     """Find unprocessed audio files."""
-    m4a_files = []
+    audio_files = []
 
-    for creator_dir in output_dir.iterdir():
-        if not creator_dir.is_dir():
-            continue
+    for creator_dir in iter_creator_dirs(output_dir):
+        # Keep each file's real suffix; if a stem exists in several formats, take the preferred one
+        audio_by_stem = {}
+        with os.scandir(creator_dir) as entries:
+            for entry in entries:
+                stem, suffix = os.path.splitext(entry.name)
+                if suffix not in AUDIO_EXTENSIONS or not entry.is_file():
+                    continue
+                current = audio_by_stem.get(stem)
+                if current is None or AUDIO_EXTENSIONS.index(suffix) < AUDIO_EXTENSIONS.index(current.suffix):
+                    audio_by_stem[stem] = creator_dir / entry.name
 
-        for file in creator_dir.glob("*.m4a"):
-            # Check if transcript already exists
-            transcripts_dir = creator_dir / "transcripts"
-            transcript_file = transcripts_dir / f"{file.stem}_transcript.json"
+        # Skip audio files whose transcript already exists
+        transcript_stems = scan_transcripts(creator_dir / "transcripts").keys()
 
-            if not transcript_file.exists():
-                m4a_files.append(file)
+        for stem in sorted(audio_by_stem.keys() - transcript_stems):
+            audio_files.append(audio_by_stem[stem])
 
-    return m4a_files
+    return audio_files
 
 
 # Audio processing utilities
 def get_audio_duration(audio_file: Path) -> float:
-    """Get audio file duration using ffprobe."""
-    cmd_duration = [
-        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-        '-of', 'default=noprint_wrappers=1:nokey=1', str(audio_file)
-    ]
-
+    """Get audio file duration from the container header."""
     try:
-        result = subprocess.run(cmd_duration, capture_output=True, text=True, check=True)
-        return float(result.stdout.strip())
+        with av.open(str(audio_file)) as container:
+            if container.duration is None:
+                return 0
+            return container.duration / av.time_base
     except Exception as e:
         print(f"  Error getting duration: {e}")
         return 0
 
 
-def split_audio_file(audio_file: Path, chunk_duration: int) -> List[Path]:
-    """Split large audio file using ffmpeg."""
+def split_audio_file(
+    audio_file: Path,
+    chunk_duration: int,
+    total_duration: Optional[float] = None
+) -> List[Path]:
+    """Split large audio file into chunks by stream-copying packets in a single pass."""
     print(f"  Splitting audio file into {chunk_duration/60:.0f}-minute chunks...")
 
-    total_duration = get_audio_duration(audio_file)
+    # Callers that already probed the file can pass its duration to skip a re-read
+    if total_duration is None:
+        total_duration = get_audio_duration(audio_file)
     if total_duration == 0:
         return []
 
@@ -102,83 +200,157 @@ def split_audio_file(audio_file: Path, chunk_duration: int) -> List[Path]:
     num_chunks = int(total_duration // chunk_duration) + 1
     chunks = []
 
-    for i in range(num_chunks):
-        start_time = i * chunk_duration
-        chunk_file = audio_file.parent / f"{audio_file.stem}_chunk{i}.m4a"
+    output = None
+    try:
+        with av.open(str(audio_file)) as container:
+            in_stream = container.streams.audio[0]
+            out_stream = None
+            chunk_index = -1
+            pts_offset = 0
+
+            for packet in container.demux(in_stream):
+                # Skip the empty flush packet emitted at end of stream
+                if packet.pts is None:
+                    continue
+
+                # AAC priming packets have negative pts; they belong to the first chunk
+                packet_index = min(max(int(packet.pts * in_stream.time_base // chunk_duration), 0), num_chunks - 1)
+
+                if output is None or packet_index != chunk_index:
+                    if output is not None:
+                        output.close()
+                        print(f"  Created chunk {chunk_index+1}/{num_chunks}")
+
+                    chunk_index = packet_index
+                    # Same container as the source, so the copied codec is always supported
+                    chunk_file = audio_file.parent / f"{audio_file.stem}_chunk{chunk_index}{audio_file.suffix}"
+                    output = av.open(str(chunk_file), mode='w')
+                    out_stream = output.add_stream_from_template(in_stream)
+                    pts_offset = packet.pts
+                    chunks.append(chunk_file)
+
+                # Rebase timestamps so each chunk starts at zero
+                packet.pts -= pts_offset
+                if packet.dts is not None:
+                    packet.dts -= pts_offset
+                packet.stream = out_stream
+                output.mux(packet)
+
+            if output is not None:
+                output.close()
+                output = None
+                print(f"  Created chunk {chunk_index+1}/{num_chunks}")
 
-        cmd_split = [
-            'ffmpeg', '-i', str(audio_file),
-            '-ss', str(start_time), '-t', str(chunk_duration),
-            '-c', 'copy', str(chunk_file), '-y'
-        ]
+    except Exception as e:
+        print(f"  Error splitting audio file: {e}")
 
-        try:
-            subprocess.run(cmd_split, capture_output=True, check=True)
-            chunks.append(chunk_file)
-            print(f"  Created chunk {i+1}/{num_chunks}")
-        except Exception as e:
-            print(f"  Error creating chunk {i}: {e}")
+        # A partial chunk list would produce a transcript with gaps, so drop it entirely
+        if output is not None:
+            try:
+                output.close()
+            except Exception:
+                pass
+        for chunk_file in chunks:
+            chunk_file.unlink(missing_ok=True)
+        return []
 
     return chunks
 
 
 def create_openai_client(api_key: str) -> OpenAI:
     """Create OpenAI client."""
-    return OpenAI(api_key=api_key)
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=WHISPER_CONCURRENCY, max_keepalive_connections=WHISPER_CONCURRENCY),
+        timeout=WHISPER_TIMEOUT_SECONDS
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
 
+def create_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Create async OpenAI client for concurrent transcription."""
+    # Concurrent chunk uploads multiplex over kept-alive HTTP/2 connections instead of new TLS handshakes
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=WHISPER_CONCURRENCY, max_keepalive_connections=WHISPER_CONCURRENCY),
+        timeout=WHISPER_TIMEOUT_SECONDS
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
+
+
+async def transcribe_chunk(
+    chunk: Path,
+    openai_client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    delete_after_read: bool = False
+) -> Optional[Dict]:
+    """Transcribe a single audio file with Whisper, bounded by the shared semaphore."""
+    async with semaphore:
+        # Read without blocking the event loop while other chunks are uploading
+        async with aiofiles.open(chunk, 'rb') as audio:
+            audio_bytes = await audio.read()
+
+        # The upload works from memory, so the file can go before the request is sent
+        if delete_after_read:
+            await aiofiles.os.remove(chunk)
+
+        transcript = await openai_client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(chunk.name, audio_bytes),
+            response_format="verbose_json",
+            timestamp_granularities=["segment"]  # Only segment timings are used downstream
+        )
 
-def transcribe_audio_file(
+    return transcript.model_dump() if hasattr(transcript, 'model_dump') else transcript
+
+
+async def transcribe_audio_file(
     audio_file: Path,
-    openai_client: OpenAI,
+    openai_client: AsyncOpenAI,
     max_chunk_duration: int
 ) -> Optional[Dict]:
     """Generate transcript from audio file using Whisper."""
     print(f"  Transcribing: {audio_file.name}")
 
     duration = get_audio_duration(audio_file)
+    semaphore = asyncio.Semaphore(WHISPER_CONCURRENCY)
 
     # Split if too large
     if duration > max_chunk_duration:
         print(f"  Audio file is {duration/60:.1f} minutes, splitting...")
-        chunks = split_audio_file(audio_file, max_chunk_duration)
+        chunks = split_audio_file(audio_file, max_chunk_duration, duration)
 
         if not chunks:
             return None
 
-        # Transcribe each chunk
+        # Transcribe all chunks concurrently
+        results = await asyncio.gather(
+            *[transcribe_chunk(chunk, openai_client, semaphore, delete_after_read=True) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        # A missing chunk would leave a permanent gap once the source audio is deleted,
+        # so keep the audio and retry the whole file on the next run
+        failed_chunks = [
+            (chunk, result) for chunk, result in zip(chunks, results) if isinstance(result, Exception)
+        ]
+        if failed_chunks:
+            for chunk, error in failed_chunks:
+                print(f"  Error transcribing chunk {chunk}: {error}")
+            print(f"  {len(failed_chunks)}/{len(chunks)} chunks failed, keeping {audio_file.name} for a retry")
+            return None
+
         all_segments = []
-        time_offset = 0
 
-        for chunk in chunks:
-            try:
-                with open(chunk, 'rb') as audio:
-                    transcript = openai_client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio,
-                        response_format="verbose_json",
-                        timestamp_granularities=["segment", "word"]
-                    )
-
-                transcript_dict = transcript.model_dump() if hasattr(transcript, 'model_dump') else transcript
-
-                # Adjust timestamps
-                for segment in transcript_dict.get('segments', []):
-                    segment['start'] += time_offset
-                    segment['end'] += time_offset
-                    if 'words' in segment:
-                        for word in segment['words']:
-                            word['start'] += time_offset
-                            word['end'] += time_offset
-                    all_segments.append(segment)
-
-                time_offset += max_chunk_duration
-
-                # Clean up chunk
-                chunk.unlink()
-
-            except Exception as e:
-                print(f"  Error transcribing chunk {chunk}: {e}")
-                continue
+        for idx, transcript_dict in enumerate(results):
+            # Offsets follow from the chunk index, so results can arrive in any order
+            time_offset = idx * max_chunk_duration
+
+            # Adjust timestamps
+            for segment in transcript_dict.get('segments', []):
+                segment['start'] += time_offset
+                segment['end'] += time_offset
+                all_segments.append(segment)
 
         return {
             'text': ' '.join(s.get('text', '') for s in all_segments),
@@ -190,15 +362,7 @@ def transcribe_audio_file(
     else:
         # Transcribe normally
         try:
-            with open(audio_file, 'rb') as audio:
-                transcript = openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio,
-                    response_format="verbose_json",
-                    timestamp_granularities=["segment", "word"]
-                )
-
-            return transcript.model_dump() if hasattr(transcript, 'model_dump') else transcript
+            return await transcribe_chunk(audio_file, openai_client, semaphore)
 
         except Exception as e:
             print(f"  Error transcribing: {e}")
@@ -208,35 +372,43 @@ def transcribe_audio_file(
 # Segment creation utilities
 def format_timestamp(start_time: float, end_time: float) -> str:
     """Format timestamp as [MM:SS-MM:SS]."""
-    start_min = int(start_time // 60)
-    start_sec = int(start_time % 60)
-    end_min = int(end_time // 60)
-    end_sec = int(end_time % 60)
+    start_min, start_sec = divmod(int(start_time), 60)
+    end_min, end_sec = divmod(int(end_time), 60)
     return f"[{start_min:02d}:{start_sec:02d}-{end_min:02d}:{end_sec:02d}]"
 
 
-def create_segment_metadata(
+def create_base_metadata(
     channel_name: str,
     video_title: str,
     video_id: str,
+    language: str = "en"
+) -> Dict:
+    """Create the metadata fields shared by every segment of a video."""
+    return {
+        'channel_name': channel_name,
+        'video_title': video_title,
+        'youtube_id': video_id,
+        'segment_type': 'transcript_segment',
+        'source': 'youtube_video',
+        'language': language
+    }
+
+
+def create_segment_metadata(
+    base_metadata: Dict,
     start_time: float,
     end_time: float,
-    language: str = "en"
+    timestamp: str
 ) -> str:
     """Create metadata JSON string for a segment."""
     metadata = {
-        'channel_name': channel_name,
-        'video_title': video_title,
-        'youtube_id': video_id,
+        **base_metadata,
         'start_time': start_time,
         'end_time': end_time,
         'duration': end_time - start_time,
-        'segment_type': 'transcript_segment',
-        'source': 'youtube_video',
-        'language': language,
-        'timestamp': format_timestamp(start_time, end_time)
+        'timestamp': timestamp
     }
-    return json.dumps(metadata)
+    return orjson.dumps(metadata).decode()
 
 
 def create_segments_from_transcript(
@@ -248,33 +420,33 @@ def create_segments_from_transcript(
 
     transcript = transcript_data.get('transcript', {})
     raw_segments = transcript.get('segments', [])
-    video_title = transcript_data.get('title', 'Unknown')
-    video_id = transcript_data.get('video_id', '')
-    language = transcript.get('language', 'en')
 
-    for segment in raw_segments:
-        start_time = segment.get('start', 0)
-        end_time = segment.get('end', 0)
-        text = segment.get('text', '').strip()
+    # Fields that are identical for every segment of this video
+    base_metadata = create_base_metadata(
+        channel_name=channel_name,
+        video_title=transcript_data.get('title', 'Unknown'),
+        video_id=transcript_data.get('video_id', ''),
+        language=transcript.get('language', 'en')
+    )
 
+    for segment in raw_segments:
+        # Whisper emits empty segments for silence; skip them before any other work
+        text = (segment.get('text') or '').strip()
         if not text:
             continue
 
+        start_time = segment.get('start', 0)
+        end_time = segment.get('end', 0)
+
         # Create segment text with timestamp
         timestamp = format_timestamp(start_time, end_time)
         segment_text = f"{timestamp} {text}"
 
-        # Create metadata
-        metadata_str = create_segment_metadata(
-            channel_name=channel_name,
-            video_title=video_title,
-            video_id=video_id,
-            start_time=start_time,
-            end_time=end_time,
-            language=language
-        )
+        # Create metadata (reusing the formatted timestamp)
+        metadata_str = create_segment_metadata(base_metadata, start_time, end_time, timestamp)
 
-        segments.append(TranscriptSegment(
+        # Fields are built here from trusted data, so skip pydantic validation
+        segments.append(TranscriptSegment.model_construct(
             text=segment_text,
             metadata=metadata_str
         ))
@@ -286,9 +458,9 @@ def create_segments_from_transcript(
 def add_segment_to_rag(segment: TranscriptSegment, rag_api_url: str) -> bool:
     """Add a segment to the RAG system via API."""
     try:
-        response = requests.post(
+        response = _SESSION.post(
             f"{rag_api_url}/api/add-document",
-            json=segment.dict(),
+            json=segment.model_dump(),
             timeout=30
         )
         response.raise_for_status()
@@ -298,6 +470,119 @@ def add_segment_to_rag(segment: TranscriptSegment, rag_api_url: str) -> bool:
         return False
 
 
+def post_segments_batch(batch: List[TranscriptSegment], rag_api_url: str) -> int:
+    """POST one batch of segments to the bulk endpoint. Returns the number accepted."""
+    try:
+        response = _SESSION.post(
+            f"{rag_api_url}/api/add-documents",
+            json={"documents": [segment.model_dump() for segment in batch]},
+            timeout=120
+        )
+        response.raise_for_status()
+        return len(batch)
+    except Exception as e:
+        print(f"    Error adding batch of {len(batch)} segments: {e}")
+        return 0
+
+
+def flush_rag_collection(rag_api_url: str) -> bool:
+    """Ask the RAG server to flush pending inserts."""
+    try:
+        response = _SESSION.post(f"{rag_api_url}/api/flush", timeout=120)
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"    Error flushing RAG collection: {e}")
+        return False
+
+
+def add_segments_batch(
+    segments: List[TranscriptSegment],
+    rag_api_url: str,
+    batch_size: int = RAG_BATCH_SIZE,
+    flush: bool = True
+) -> int:
+    """Add segments to the RAG system in bulk. Returns the number of segments accepted.
+
+    Batches are inserted without flushing; when flush is set, a single flush
+    is requested after every batch of the file has been accepted.
+    """
+    batches = [segments[start:start + batch_size] for start in range(0, len(segments), batch_size)]
+
+    if len(batches) <= 1:
+        success_count = sum(post_segments_batch(batch, rag_api_url) for batch in batches)
+    else:
+        # Upload batches concurrently over the shared connection pool
+        with ThreadPoolExecutor(max_workers=min(RAG_UPLOAD_WORKERS, len(batches))) as executor:
+            success_count = sum(executor.map(lambda batch: post_segments_batch(batch, rag_api_url), batches))
+
+    if flush and segments and success_count == len(segments):
+        flush_rag_collection(rag_api_url)
+
+    return success_count
+
+
+async def post_segments_batch_async(batch: List[TranscriptSegment], rag_api_url: str) -> int:
+    """POST one batch of segments to the bulk endpoint using the shared async client."""
+    try:
+        response = await get_async_http_client().post(
+            f"{rag_api_url}/api/add-documents",
+            json={"documents": [segment.model_dump() for segment in batch]}
+        )
+        response.raise_for_status()
+        return len(batch)
+    except Exception as e:
+        print(f"    Error adding batch of {len(batch)} segments: {e}")
+        return 0
+
+
+async def flush_rag_collection_async(rag_api_url: str) -> bool:
+    """Ask the RAG server to flush pending inserts using the shared async client."""
+    try:
+        response = await get_async_http_client().post(f"{rag_api_url}/api/flush")
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"    Error flushing RAG collection: {e}")
+        return False
+
+
+async def add_segments_batch_async(
+    segments: List[TranscriptSegment],
+    rag_api_url: str,
+    batch_size: int = RAG_BATCH_SIZE,
+    flush: bool = True
+) -> int:
+    """Add segments to the RAG system in concurrent bulk requests multiplexed over HTTP/2."""
+    batches = [segments[start:start + batch_size] for start in range(0, len(segments), batch_size)]
+    semaphore = asyncio.Semaphore(RAG_UPLOAD_WORKERS)
+
+    async def post_with_limit(batch: List[TranscriptSegment]) -> int:
+        async with semaphore:
+            return await post_segments_batch_async(batch, rag_api_url)
+
+    results = await asyncio.gather(*[post_with_limit(batch) for batch in batches])
+    success_count = sum(results)
+
+    if flush and segments and success_count == len(segments):
+        await flush_rag_collection_async(rag_api_url)
+
+    return success_count
+
+
+def load_transcript_segments(transcript_file: Path) -> List[TranscriptSegment]:
+    """Read a transcript file and break it into RAG segments."""
+    data = load_transcript_file(transcript_file)
+
+    # Extract channel name from path
+    channel_name = transcript_file.parent.parent.name.replace("_", " ")
+
+    # Create segments
+    segments = create_segments_from_transcript(data, channel_name)
+    print(f"  Created {len(segments)} segments")
+    return segments
+
+
 def process_transcript_file(
     transcript_file: Path,
     rag_api_url: str
@@ -306,21 +591,31 @@ def process_transcript_file(
     print(f"\nProcessing: {transcript_file}")
 
     try:
-        with open(transcript_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        segments = load_transcript_segments(transcript_file)
 
-        # Extract channel name from path
-        channel_name = transcript_file.parent.parent.name.replace("_", " ")
+        # Add to RAG
+        success_count = add_segments_batch(segments, rag_api_url)
+
+        print(f"  Added {success_count}/{len(segments)} segments to RAG")
+        return success_count
 
-        # Create segments
-        segments = create_segments_from_transcript(data, channel_name)
+    except Exception as e:
+        print(f"  Error processing transcript: {e}")
+        return 0
+
+
+async def process_transcript_data_async(
+    transcript_data: Dict,
+    channel_name: str,
+    rag_api_url: str
+) -> int:
+    """Segment an in-memory transcript and add it to the RAG system."""
+    try:
+        segments = create_segments_from_transcript(transcript_data, channel_name)
         print(f"  Created {len(segments)} segments")
 
         # Add to RAG
-        success_count = 0
-        for segment in segments:
-            if add_segment_to_rag(segment, rag_api_url):
-                success_count += 1
+        success_count = await add_segments_batch_async(segments, rag_api_url)
 
         print(f"  Added {success_count}/{len(segments)} segments to RAG")
         return success_count
@@ -374,38 +669,54 @@ def process_unprocessed_audio_files(
     print("PROCESSING AUDIO FILES")
     print("="*80)
 
-    openai_client = create_openai_client(openai_api_key)
-    m4a_files = find_unprocessed_audio_files(output_dir)
-    print(f"Found {len(m4a_files)} unprocessed audio files")
+    audio_files = find_unprocessed_audio_files(output_dir)
+    print(f"Found {len(audio_files)} unprocessed audio files")
+
+    return asyncio.run(transcribe_audio_files(audio_files, openai_api_key, max_chunk_duration))
+
 
+async def transcribe_audio_files(
+    audio_files: List[Path],
+    openai_api_key: str,
+    max_chunk_duration: int
+) -> int:
+    """Transcribe audio files and save their transcripts."""
+    openai_client = create_async_openai_client(openai_api_key)
     processed = 0
 
-    for idx, audio_file in enumerate(m4a_files, 1):
-        print(f"\n[{idx}/{len(m4a_files)}] {audio_file.name}")
+    try:
+        for idx, audio_file in enumerate(audio_files, 1):
+            print(f"\n[{idx}/{len(audio_files)}] {audio_file.name}")
 
-        transcript = transcribe_audio_file(audio_file, openai_client, max_chunk_duration)
-        if transcript:
-            # Save transcript
-            transcripts_dir = audio_file.parent / "transcripts"
-            transcripts_dir.mkdir(exist_ok=True)
+            transcript = await transcribe_audio_file(audio_file, openai_client, max_chunk_duration)
+            if transcript:
+                # Save transcript
+                transcripts_dir = audio_file.parent / "transcripts"
+                transcripts_dir.mkdir(exist_ok=True)
 
-            transcript_file = transcripts_dir / f"{audio_file.stem}_transcript.json"
+                transcript_file = transcripts_dir / f"{audio_file.stem}{COMPRESSED_TRANSCRIPT_SUFFIX}"
 
-            with open(transcript_file, 'w', encoding='utf-8') as f:
-                json.dump({
+                payload = zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(orjson.dumps({
                     'video_id': audio_file.stem,
                     'title': audio_file.stem,
                     'url': f"https://youtube.com/watch?v={audio_file.stem}",
                     'duration': transcript.get('duration', 0),
                     'transcript': transcript
-                }, f, indent=2)
+                }))
+
+                async with aiofiles.open(transcript_file, 'wb') as f:
+                    await f.write(payload)
+
+                print(f"  Saved transcript to {transcript_file}")
+                processed += 1
 
-            print(f"  Saved transcript to {transcript_file}")
-            processed += 1
+                # Clean up audio file
+                await aiofiles.os.remove(audio_file)
+                print(f"  Deleted audio file")
 
-            # Clean up audio file
-            audio_file.unlink()
-            print(f"  Deleted audio file")
+    finally:
+        # We passed in the HTTP/2 pool, so the SDK won't close it on its own
+        await openai_client.close()
 
     return processed
 
@@ -419,7 +730,7 @@ def main() -> None:
     # Process existing transcripts
     process_all_transcripts(OUTPUT_DIR, RAG_API_URL)
 
-    # Optionally process any m4a files found
+    # Optionally process any leftover audio files found
     # process_unprocessed_audio_files(OUTPUT_DIR, OPENAI_API_KEY, MAX_CHUNK_DURATION)
 
 
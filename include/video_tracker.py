@@ -5,8 +5,9 @@ Tracks processed videos to avoid duplicates and manage pipeline state
 """
 
 import sqlite3
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -29,123 +30,237 @@ class ProcessingStats(BaseModel):
     recent_errors: int
 
 
+# Configuration
+CLAIM_TIMEOUT_HOURS = 6  # In-progress claims older than this are treated as abandoned
+DB_BUSY_TIMEOUT_SECONDS = 30  # How long a write waits for another connection's lock
+
+
+# Global state
+# Processed video IDs per database, kept in memory so lookups skip SQLite
+_processed_ids_cache: Dict[str, Set[str]] = {}
+# SQLite connections are per-thread, so each thread keeps its own open connections
+_thread_local = threading.local()
+
+
 # Database utilities
 def get_database_connection(db_path: str = "video_tracker.db") -> sqlite3.Connection:
-    """Get database connection."""
-    return sqlite3.connect(db_path)
+    """Get this thread's cached database connection, opening it on first use."""
+    connections = getattr(_thread_local, "connections", None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_SECONDS)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        connections[db_path] = conn
+
+    return conn
 
 
 def initialize_database(db_path: str = "video_tracker.db") -> None:
     """Create database tables if they don't exist."""
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
 
-    # Table to track processed videos
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS processed_videos (
-            video_id TEXT PRIMARY KEY,
-            channel_name TEXT NOT NULL,
-            video_title TEXT NOT NULL,
-            upload_date TEXT,
-            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            transcript_path TEXT,
-            rag_integrated BOOLEAN DEFAULT 0,
-            status TEXT DEFAULT 'completed'
-        )
-    """)
-
-    # Table to track last check time for each channel
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS channel_checks (
-            channel_name TEXT PRIMARY KEY,
-            last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_video_id TEXT
-        )
-    """)
-
-    # Table to track processing errors
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS processing_errors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            video_id TEXT,
-            channel_name TEXT,
-            error_message TEXT,
-            occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    with conn:
+        # Table to track processed videos
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_videos (
+                video_id TEXT PRIMARY KEY,
+                channel_name TEXT NOT NULL,
+                video_title TEXT NOT NULL,
+                upload_date TEXT,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                transcript_path TEXT,
+                rag_integrated BOOLEAN DEFAULT 0,
+                status TEXT DEFAULT 'completed'
+            )
+        """)
+
+        # Table to track last check time for each channel
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS channel_checks (
+                channel_name TEXT PRIMARY KEY,
+                last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_video_id TEXT
+            )
+        """)
+
+        # Table to track processing errors
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS processing_errors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_id TEXT,
+                channel_name TEXT,
+                error_message TEXT,
+                occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Indexes for the pending-integration, per-channel and recent-error queries
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_processed_rag_integrated ON processed_videos(rag_integrated)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_processed_channel ON processed_videos(channel_name)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_errors_occurred_at ON processing_errors(occurred_at)")
+
+    load_processed_ids_cache(db_path)
+
+
+def load_processed_ids_cache(db_path: str = "video_tracker.db") -> None:
+    """Load all processed video IDs into memory for fast membership checks."""
+    conn = get_database_connection(db_path)
 
-    conn.commit()
-    conn.close()
+    cursor = conn.execute("SELECT video_id FROM processed_videos WHERE status != 'in_progress'")
+    _processed_ids_cache[db_path] = {row[0] for row in cursor.fetchall()}
 
 
 def is_video_processed(video_id: str, db_path: str = "video_tracker.db") -> bool:
     """Check if a video has already been processed."""
+    if db_path in _processed_ids_cache:
+        return video_id in _processed_ids_cache[db_path]
+
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
 
-    cursor.execute(
-        "SELECT COUNT(*) FROM processed_videos WHERE video_id = ?",
+    cursor = conn.execute(
+        "SELECT COUNT(*) FROM processed_videos WHERE video_id = ? AND status != 'in_progress'",
         (video_id,)
     )
     count = cursor.fetchone()[0]
-    conn.close()
 
     return count > 0
 
 
+def get_processed_ids(video_ids: List[str], db_path: str = "video_tracker.db") -> Set[str]:
+    """Return the subset of video IDs that have already been processed."""
+    if not video_ids:
+        return set()
+
+    if db_path in _processed_ids_cache:
+        return _processed_ids_cache[db_path].intersection(video_ids)
+
+    conn = get_database_connection(db_path)
+
+    placeholders = ",".join("?" for _ in video_ids)
+    cursor = conn.execute(
+        f"SELECT video_id FROM processed_videos WHERE video_id IN ({placeholders}) AND status != 'in_progress'",
+        list(video_ids)
+    )
+
+    return {row[0] for row in cursor.fetchall()}
+
+
+def try_claim_video(
+    video_id: str,
+    channel_name: str,
+    video_title: str,
+    db_path: str = "video_tracker.db"
+) -> bool:
+    """Atomically reserve a video for processing. Returns False if it is already processed or claimed."""
+    conn = get_database_connection(db_path)
+
+    # Inserts a new claim, or takes over an abandoned one; RETURNING is empty otherwise
+    with conn:
+        cursor = conn.execute("""
+            INSERT INTO processed_videos (video_id, channel_name, video_title, status)
+            VALUES (?, ?, ?, 'in_progress')
+            ON CONFLICT(video_id) DO UPDATE SET processed_at = CURRENT_TIMESTAMP
+            WHERE status = 'in_progress' AND processed_at < datetime('now', ?)
+            RETURNING video_id
+        """, (video_id, channel_name, video_title, f"-{CLAIM_TIMEOUT_HOURS} hours"))
+        claimed = len(cursor.fetchall()) > 0
+
+    return claimed
+
+
+def release_video_claim(video_id: str, db_path: str = "video_tracker.db") -> None:
+    """Drop an unfinished claim so the video is retried on the next run."""
+    conn = get_database_connection(db_path)
+
+    with conn:
+        conn.execute(
+            "DELETE FROM processed_videos WHERE video_id = ? AND status = 'in_progress'",
+            (video_id,)
+        )
+
+
 def mark_video_processed(
     video_record: VideoRecord,
     db_path: str = "video_tracker.db"
 ) -> None:
     """Mark a video as processed."""
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT OR REPLACE INTO processed_videos
-        (video_id, channel_name, video_title, upload_date, transcript_path, rag_integrated)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
-        video_record.video_id,
-        video_record.channel_name,
-        video_record.video_title,
-        video_record.upload_date,
-        video_record.transcript_path,
-        video_record.rag_integrated
-    ))
-
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO processed_videos
+            (video_id, channel_name, video_title, upload_date, transcript_path, rag_integrated)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            video_record.video_id,
+            video_record.channel_name,
+            video_record.video_title,
+            video_record.upload_date,
+            video_record.transcript_path,
+            video_record.rag_integrated
+        ))
+
+    if db_path in _processed_ids_cache:
+        _processed_ids_cache[db_path].add(video_record.video_id)
+
+
+def mark_videos_processed(
+    video_records: List[VideoRecord],
+    db_path: str = "video_tracker.db"
+) -> None:
+    """Mark several videos as processed in a single transaction."""
+    if not video_records:
+        return
+
+    conn = get_database_connection(db_path)
+
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO processed_videos
+            (video_id, channel_name, video_title, upload_date, transcript_path, rag_integrated)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                record.video_id,
+                record.channel_name,
+                record.video_title,
+                record.upload_date,
+                record.transcript_path,
+                record.rag_integrated
+            )
+            for record in video_records
+        ])
+
+    if db_path in _processed_ids_cache:
+        _processed_ids_cache[db_path].update(record.video_id for record in video_records)
 
 
 def mark_rag_integrated(video_id: str, db_path: str = "video_tracker.db") -> None:
     """Mark a video as integrated into RAG system."""
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
 
-    cursor.execute(
-        "UPDATE processed_videos SET rag_integrated = 1 WHERE video_id = ?",
-        (video_id,)
-    )
-
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            "UPDATE processed_videos SET rag_integrated = 1 WHERE video_id = ?",
+            (video_id,)
+        )
 
 
 def get_unintegrated_videos(db_path: str = "video_tracker.db") -> List[Dict[str, str]]:
     """Get videos that have been transcribed but not added to RAG."""
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
 
-    cursor.execute("""
+    cursor = conn.execute("""
         SELECT video_id, channel_name, video_title, transcript_path
         FROM processed_videos
-        WHERE rag_integrated = 0
+        WHERE rag_integrated = 0 AND status != 'in_progress'
     """)
 
-    results = cursor.fetchall()
-    conn.close()
-
     return [
         {
             'video_id': row[0],
@@ -153,7 +268,7 @@ def get_unintegrated_videos(db_path: str = "video_tracker.db") -> List[Dict[str,
             'video_title': row[2],
             'transcript_path': row[3]
         }
-        for row in results
+        for row in cursor.fetchall()
     ]
 
 
@@ -165,15 +280,12 @@ def log_processing_error(
 ) -> None:
     """Log a processing error."""
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT INTO processing_errors (video_id, channel_name, error_message)
-        VALUES (?, ?, ?)
-    """, (video_id, channel_name, error_message))
-
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            INSERT INTO processing_errors (video_id, channel_name, error_message)
+            VALUES (?, ?, ?)
+        """, (video_id, channel_name, error_message))
 
 
 def update_channel_check(
@@ -183,15 +295,12 @@ def update_channel_check(
 ) -> None:
     """Update the last check time for a channel."""
     conn = get_database_connection(db_path)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        INSERT OR REPLACE INTO channel_checks (channel_name, last_checked, last_video_id)
-        VALUES (?, CURRENT_TIMESTAMP, ?)
-    """, (channel_name, last_video_id))
 
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO channel_checks (channel_name, last_checked, last_video_id)
+            VALUES (?, CURRENT_TIMESTAMP, ?)
+        """, (channel_name, last_video_id))
 
 
 def get_processing_stats(db_path: str = "video_tracker.db") -> ProcessingStats:
@@ -199,21 +308,17 @@ def get_processing_stats(db_path: str = "video_tracker.db") -> ProcessingStats:
     conn = get_database_connection(db_path)
     cursor = conn.cursor()
 
-    # Total processed videos
-    cursor.execute("SELECT COUNT(*) FROM processed_videos")
-    total_processed = cursor.fetchone()[0]
-
-    # RAG integrated videos
-    cursor.execute("SELECT COUNT(*) FROM processed_videos WHERE rag_integrated = 1")
-    rag_integrated = cursor.fetchone()[0]
-
-    # Videos by channel
+    # Totals, RAG integrated and videos by channel in one grouped query; open claims aren't processed yet
     cursor.execute("""
-        SELECT channel_name, COUNT(*) as count
+        SELECT channel_name, COUNT(*), SUM(rag_integrated)
         FROM processed_videos
+        WHERE status != 'in_progress'
         GROUP BY channel_name
     """)
-    by_channel = {row[0]: row[1] for row in cursor.fetchall()}
+    rows = cursor.fetchall()
+    by_channel = {row[0]: row[1] for row in rows}
+    total_processed = sum(row[1] for row in rows)
+    rag_integrated = sum(row[2] or 0 for row in rows)
 
     # Recent errors
     cursor.execute("""
@@ -222,8 +327,6 @@ def get_processing_stats(db_path: str = "video_tracker.db") -> ProcessingStats:
     """)
     recent_errors = cursor.fetchone()[0]
 
-    conn.close()
-
     return ProcessingStats(
         total_processed=total_processed,
         rag_integrated=rag_integrated,
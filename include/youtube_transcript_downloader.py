@@ -5,18 +5,30 @@ Downloads videos from specified music production creators and generates transcri
 """
 
 import os
-import json
+import re
+import sqlite3
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import atexit
 import base64
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+import av
+import httpx
+import orjson
 import yt_dlp
+import zstandard as zstd
 from openai import OpenAI
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 # Load environment variables
 load_dotenv()
@@ -28,6 +40,21 @@ OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "music_tutorials"))
 MAX_VIDEOS_PER_CREATOR = 5
 MAX_AUDIO_SIZE_MB = 24  # Whisper API limit is 25 MB, use 24 to be safe
 CHUNK_DURATION_MINUTES = 20  # Duration of each audio chunk for large files
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "5"))  # Videos downloaded/transcribed concurrently per creator
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", "5"))  # Audio chunks of one video transcribed concurrently
+WORD_TIMESTAMPS = os.getenv("WORD_TIMESTAMPS", "0") == "1"  # Also request per-word timings from Whisper
+SAVE_METADATA = os.getenv("SAVE_METADATA", "0") == "1"  # Keep yt-dlp's info.json and thumbnail next to the audio
+TRANSCODE_AUDIO = os.getenv("TRANSCODE_AUDIO", "1") == "1"  # Re-encode downloads to small mono 16 kHz MP3 for Whisper
+TRANSCODE_BITRATE_KBPS = os.getenv("TRANSCODE_BITRATE_KBPS", "32")  # ~0.24 MB per minute, so ~100 minutes fit one request
+WHISPER_RPM = int(os.getenv("WHISPER_RPM", "50"))  # Whisper requests allowed per rolling minute
+WHISPER_CONCURRENCY = int(os.getenv("WHISPER_CONCURRENCY", "8"))  # Whisper requests in flight across all threads
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))  # Retries with exponential backoff on 429s and 5xx
+WHISPER_TIMEOUT_SECONDS = float(os.getenv("WHISPER_TIMEOUT_SECONDS", "600"))  # Per-request timeout for audio uploads
+TRANSCRIPT_ZSTD_LEVEL = 3  # Compression level for saved transcript JSON
+# ISO 8601 durations as returned by the YouTube Data API, e.g. PT1H2M3S or P1DT2H
+DURATION_PATTERN = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+API_CACHE_DB = os.getenv("API_CACHE_DB", "video_tracker.db")  # SQLite file holding cached YouTube API responses
+API_CACHE_BUSY_TIMEOUT_SECONDS = 30  # How long a cache write waits for the tracker's lock on the shared database
 
 # Music Production Creators Configuration
 CREATORS = {
@@ -43,13 +70,18 @@ CREATORS = {
 
 
 # Pydantic Models
+# Records are built once and only read afterwards, so they are frozen
 class VideoMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     url: str
 
 
 class DownloadedVideo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     video_id: str
     title: str
     url: str
@@ -60,6 +92,8 @@ class DownloadedVideo(BaseModel):
 
 
 class TranscriptData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     text: str
     language: str
     duration: float
@@ -68,15 +102,134 @@ class TranscriptData(BaseModel):
 
 
 class ProcessingSummary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     total_creators: int
     total_videos_processed: int
     creators_processed: Dict[str, int]
     timestamp: str
 
 
+# Global state
+# Channel ID -> uploads playlist ID, resolved in batches and shared by creator threads
+_uploads_playlists: Dict[str, str] = {}
+_uploads_playlists_lock = threading.Lock()
+# httplib2, sqlite3 and YoutubeDL objects aren't thread-safe, so each thread keeps its own API client, cache connection and downloaders
+_thread_local = threading.local()
+
+
+def get_youtube_client() -> any:
+    """Get this thread's YouTube Data API client, creating it on first use."""
+    youtube = getattr(_thread_local, "youtube", None)
+    if youtube is None:
+        youtube = _thread_local.youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+    return youtube
+
+
+# API response caching utilities
+def get_api_cache(db_path: str = API_CACHE_DB) -> sqlite3.Connection:
+    """Get this thread's API cache connection, opening it and creating its tables on first use."""
+    connections = getattr(_thread_local, "api_cache_connections", None)
+    if connections is None:
+        connections = _thread_local.api_cache_connections = {}
+
+    conn = connections.get(db_path)
+    if conn is not None:
+        return conn
+
+    # Shares video_tracker.db by default, so open it the way the tracker does
+    conn = sqlite3.connect(db_path, timeout=API_CACHE_BUSY_TIMEOUT_SECONDS)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                etag TEXT NOT NULL,
+                body TEXT NOT NULL,
+                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Channel URL -> channel ID; effectively immutable, so entries never expire
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS channel_ids (
+                channel_url TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL
+            )
+        """)
+    connections[db_path] = conn
+
+    return conn
+
+
+def get_cached_response(cache_key: str, db_path: str = API_CACHE_DB) -> Optional[Dict]:
+    """Get a cached API response (with its ETag) by cache key."""
+    row = get_api_cache(db_path).execute(
+        "SELECT body FROM api_response_cache WHERE cache_key = ?",
+        (cache_key,)
+    ).fetchone()
+
+    return orjson.loads(row[0]) if row else None
+
+
+def store_cached_response(cache_key: str, response: Dict, db_path: str = API_CACHE_DB) -> None:
+    """Store an API response keyed by cache key, if it carries an ETag."""
+    if not response.get('etag'):
+        return
+
+    conn = get_api_cache(db_path)
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO api_response_cache (cache_key, etag, body, cached_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """, (cache_key, response['etag'], orjson.dumps(response).decode()))
+
+
+def get_cached_channel_id(channel_url: str, db_path: str = API_CACHE_DB) -> Optional[str]:
+    """Get a previously resolved channel ID for a channel URL."""
+    row = get_api_cache(db_path).execute(
+        "SELECT channel_id FROM channel_ids WHERE channel_url = ?",
+        (channel_url,)
+    ).fetchone()
+
+    return row[0] if row else None
+
+
+def store_channel_id(channel_url: str, channel_id: str, db_path: str = API_CACHE_DB) -> None:
+    """Remember the channel ID resolved for a channel URL."""
+    conn = get_api_cache(db_path)
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO channel_ids (channel_url, channel_id) VALUES (?, ?)",
+            (channel_url, channel_id)
+        )
+
+
+def execute_with_etag(request: any, cache_key: str) -> Dict:
+    """Execute a YouTube API request conditionally, reusing the cached body on 304 Not Modified."""
+    cached = get_cached_response(cache_key)
+    if cached:
+        request.headers['If-None-Match'] = cached['etag']
+
+    try:
+        response = request.execute()
+    except HttpError as e:
+        if cached and e.resp.status == 304:
+            return cached
+        raise
+
+    store_cached_response(cache_key, response)
+    return response
+
+
 # YouTube utilities
 def get_channel_id_from_url(channel_url: str, youtube_api: any) -> Optional[str]:
     """Extract channel ID from various YouTube URL formats."""
+    # Handle -> channel ID never changes, so skip the API after the first lookup
+    cached_channel_id = get_cached_channel_id(channel_url)
+    if cached_channel_id:
+        return cached_channel_id
+
     try:
         # Extract username/handle from URL
         # Formats: youtube.com/@username or youtube.com/c/channelname or youtube.com/user/username
@@ -84,7 +237,18 @@ def get_channel_id_from_url(channel_url: str, youtube_api: any) -> Optional[str]
             # Handle format: youtube.com/@username
             handle = channel_url.split('@')[-1].rstrip('/')
 
-            # Use YouTube API to search for channel by handle
+            # Exact handle lookup (1 quota unit)
+            response = youtube_api.channels().list(
+                part='id',
+                forHandle=handle
+            ).execute()
+
+            if response.get('items'):
+                channel_id = response['items'][0]['id']
+                store_channel_id(channel_url, channel_id)
+                return channel_id
+
+            # Fall back to searching by name (100 quota units, may be inexact)
             request = youtube_api.search().list(
                 part='snippet',
                 q=handle,
@@ -94,7 +258,9 @@ def get_channel_id_from_url(channel_url: str, youtube_api: any) -> Optional[str]
             response = request.execute()
 
             if response['items']:
-                return response['items'][0]['snippet']['channelId']
+                channel_id = response['items'][0]['snippet']['channelId']
+                store_channel_id(channel_url, channel_id)
+                return channel_id
 
         # Try to get channel ID from forUsername or custom URL
         # This is a fallback for other URL formats
@@ -105,6 +271,41 @@ def get_channel_id_from_url(channel_url: str, youtube_api: any) -> Optional[str]
         return None
 
 
+def fetch_uploads_playlists(channel_ids: List[str], youtube_api: any) -> Dict[str, str]:
+    """Look up the uploads playlist IDs for several channels, 50 per API call."""
+    uploads_playlists = {}
+
+    for start in range(0, len(channel_ids), 50):
+        response = youtube_api.channels().list(
+            part='contentDetails',
+            id=','.join(channel_ids[start:start + 50]),
+            maxResults=50,
+            fields='items(id,contentDetails/relatedPlaylists/uploads)'
+        ).execute()
+
+        for item in response.get('items', []):
+            uploads_playlists[item['id']] = item['contentDetails']['relatedPlaylists']['uploads']
+
+    return uploads_playlists
+
+
+def get_uploads_playlist_id(channel_id: str, youtube_api: any) -> Optional[str]:
+    """Get a channel's uploads playlist ID, resolving every known creator channel in the same call."""
+    with _uploads_playlists_lock:
+        if channel_id not in _uploads_playlists:
+            # Batch in the other creators whose channel IDs are already known
+            channel_ids = {channel_id}
+            for creator_info in CREATORS.values():
+                known_channel_id = get_cached_channel_id(creator_info['url'])
+                if known_channel_id:
+                    channel_ids.add(known_channel_id)
+
+            missing_ids = sorted(channel_ids - _uploads_playlists.keys())
+            _uploads_playlists.update(fetch_uploads_playlists(missing_ids, youtube_api))
+
+        return _uploads_playlists.get(channel_id)
+
+
 def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetadata]:
     """Fetch video metadata from a channel using YouTube Data API v3. Filters out YouTube Shorts."""
 
@@ -115,8 +316,8 @@ def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetad
     print(f"Fetching videos from: {channel_url}")
 
     try:
-        # Create YouTube API client
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+        # Reuse the thread's API client so its HTTP connection stays open across creators
+        youtube = get_youtube_client()
 
         # Get channel ID from URL
         channel_id = get_channel_id_from_url(channel_url, youtube)
@@ -128,28 +329,27 @@ def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetad
         print(f"  Channel ID: {channel_id}")
 
         # Get channel's uploads playlist ID
-        channel_request = youtube.channels().list(
-            part='contentDetails',
-            id=channel_id
-        )
-        channel_response = channel_request.execute()
+        uploads_playlist_id = get_uploads_playlist_id(channel_id, youtube)
 
-        if not channel_response['items']:
+        if not uploads_playlist_id:
             print(f"  Error: Could not find channel")
             return []
 
-        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-
         # Get recent videos from uploads playlist
         # Fetch more than needed to account for shorts we'll filter out
         playlist_request = youtube.playlistItems().list(
             part='snippet',
             playlistId=uploads_playlist_id,
-            maxResults=min(max_videos * 3, 50)  # API max is 50
+            maxResults=min(max_videos * 3, 50),  # API max is 50
+            # Only the video IDs are read; etag is kept for the conditional-request cache
+            fields='etag,items(snippet(resourceId/videoId))'
+        )
+        playlist_response = execute_with_etag(
+            playlist_request,
+            f"playlistItems:{uploads_playlist_id}:{max_videos}"
         )
-        playlist_response = playlist_request.execute()
 
-        if not playlist_response['items']:
+        if not playlist_response.get('items'):
             print(f"  No videos found")
             return []
 
@@ -159,14 +359,15 @@ def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetad
         # Get video details (including duration) for all videos at once
         videos_request = youtube.videos().list(
             part='contentDetails,snippet',
-            id=','.join(video_ids)
+            id=','.join(video_ids),
+            fields='etag,items(id,contentDetails/duration,snippet/title)'
         )
-        videos_response = videos_request.execute()
+        videos_response = execute_with_etag(videos_request, f"videos:{','.join(video_ids)}")
 
         videos = []
         shorts_filtered = 0
 
-        for video_item in videos_response['items']:
+        for video_item in videos_response.get('items', []):
             # Parse ISO 8601 duration (e.g., "PT15M33S" = 15 minutes 33 seconds)
             duration_str = video_item['contentDetails']['duration']
             duration_seconds = parse_duration(duration_str)
@@ -177,7 +378,8 @@ def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetad
                 print(f"  Skipping Short: {video_item['snippet']['title']} ({duration_seconds}s)")
                 continue
 
-            videos.append(VideoMetadata(
+            # Fields come straight from the Data API response; no validation needed
+            videos.append(VideoMetadata.model_construct(
                 id=video_item['id'],
                 title=video_item['snippet']['title'],
                 url=f"https://www.youtube.com/watch?v={video_item['id']}"
@@ -203,41 +405,60 @@ def parse_duration(duration: str) -> int:
     """Parse ISO 8601 duration string to seconds.
     Example: PT15M33S -> 933 seconds
     """
-    import re
+    match = DURATION_PATTERN.match(duration)
+    if not match:
+        return 0
 
-    # Remove 'PT' prefix
-    duration = duration.replace('PT', '')
+    days, hours, minutes, seconds = (int(value) if value else 0 for value in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
 
-    # Extract hours, minutes, seconds
-    hours = 0
-    minutes = 0
-    seconds = 0
 
-    # Match patterns
-    hour_match = re.search(r'(\d+)H', duration)
-    minute_match = re.search(r'(\d+)M', duration)
-    second_match = re.search(r'(\d+)S', duration)
+@lru_cache(maxsize=1)
+def get_cookies_file() -> Optional[str]:
+    """Decode YOUTUBE_COOKIES_B64 once into a private temp file shared by all downloads."""
+    youtube_cookies_b64 = os.getenv("YOUTUBE_COOKIES_B64")
+    if not youtube_cookies_b64:
+        return None
 
-    if hour_match:
-        hours = int(hour_match.group(1))
-    if minute_match:
-        minutes = int(minute_match.group(1))
-    if second_match:
-        seconds = int(second_match.group(1))
+    try:
+        cookies_content = base64.b64decode(youtube_cookies_b64).decode('utf-8')
 
-    return hours * 3600 + minutes * 60 + seconds
+        # mkstemp creates the file with 0600 permissions
+        fd, cookies_file = tempfile.mkstemp(suffix='.txt', prefix='yt_cookies_')
+        with os.fdopen(fd, 'w') as f:
+            f.write(cookies_content)
 
+        atexit.register(remove_cookies_file, cookies_file)
+        print(f"  Using YouTube cookies for authentication")
+        return cookies_file
+    except Exception as e:
+        print(f"  Warning: Could not load YouTube cookies: {e}")
+        return None
 
-def download_video_audio(video_url: str, creator_dir: Path) -> Optional[DownloadedVideo]:
-    """Download audio from a YouTube video."""
-    print(f"  Downloading: {video_url}")
 
+def remove_cookies_file(cookies_file: str) -> None:
+    """Delete the decoded cookies file at exit."""
+    try:
+        os.remove(cookies_file)
+    except FileNotFoundError:
+        pass
+
+
+def build_download_opts(creator_dir: Path) -> Dict:
+    """Build the yt-dlp options for downloading audio into a creator directory."""
     ydl_opts = {
         'format': 'bestaudio[ext=m4a]/bestaudio',
         'outtmpl': str(creator_dir / '%(id)s.%(ext)s'),
         'quiet': False,
-        'writeinfojson': True,
-        'writethumbnail': True,
+        'writeinfojson': SAVE_METADATA,
+        'writethumbnail': SAVE_METADATA,
+        # Whisper resamples to 16 kHz mono anyway, so smaller files upload faster and rarely need chunking
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': TRANSCODE_BITRATE_KBPS,
+        }] if TRANSCODE_AUDIO else [],
+        'postprocessor_args': {'extractaudio': ['-ac', '1', '-ar', '16000']},
         # Add browser-like behavior to avoid bot detection
         'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'extractor_args': {
@@ -254,72 +475,120 @@ def download_video_audio(video_url: str, creator_dir: Path) -> Optional[Download
     }
 
     # Handle YouTube cookies for authentication
-    cookies_file = None
-    youtube_cookies_b64 = os.getenv("YOUTUBE_COOKIES_B64")
+    cookies_file = get_cookies_file()
+    if cookies_file:
+        ydl_opts['cookiefile'] = cookies_file
 
-    if youtube_cookies_b64:
-        try:
-            # Decode base64 cookies and write to temporary file
-            cookies_content = base64.b64decode(youtube_cookies_b64).decode('utf-8')
+    return ydl_opts
 
-            # Create temporary file for cookies
-            fd, cookies_file = tempfile.mkstemp(suffix='.txt', prefix='yt_cookies_')
-            with os.fdopen(fd, 'w') as f:
-                f.write(cookies_content)
 
-            ydl_opts['cookiefile'] = cookies_file
-            print(f"  Using YouTube cookies for authentication")
-        except Exception as e:
-            print(f"  Warning: Could not load YouTube cookies: {e}")
+def get_audio_downloader(creator_dir: Path) -> yt_dlp.YoutubeDL:
+    """Get this thread's downloader for a creator directory, creating it on first use."""
+    # Reusing the instance keeps extractors initialised and HTTP connections open across videos
+    downloaders = getattr(_thread_local, "downloaders", None)
+    if downloaders is None:
+        downloaders = _thread_local.downloaders = {}
+
+    ydl = downloaders.get(creator_dir)
+    if ydl is None:
+        ydl = downloaders[creator_dir] = yt_dlp.YoutubeDL(build_download_opts(creator_dir))
+    return ydl
+
+
+def download_video_audio(video_url: str, creator_dir: Path) -> Optional[DownloadedVideo]:
+    """Download audio from a YouTube video."""
+    print(f"  Downloading: {video_url}")
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=True)
+        info = get_audio_downloader(creator_dir).extract_info(video_url, download=True)
+
+        # yt-dlp reports where it wrote the audio; only scan extensions if it didn't
+        requested_downloads = info.get('requested_downloads') or [{}]
+        audio_file = requested_downloads[0].get('filepath')
 
-            # Find the downloaded audio file
-            audio_file = None
+        if not audio_file or not os.path.exists(audio_file):
             for ext in ['m4a', 'mp3', 'webm']:
                 file_path = creator_dir / f"{info['id']}.{ext}"
                 if file_path.exists():
                     audio_file = str(file_path)
                     break
 
-            if not audio_file:
-                print(f"  Warning: Could not find audio file")
-                return None
+        if not audio_file:
+            print(f"  Warning: Could not find audio file")
+            return None
 
-            thumbnail_path = creator_dir / f"{info['id']}.jpg"
+        thumbnail_path = creator_dir / f"{info['id']}.jpg"
 
-            return DownloadedVideo(
-                video_id=info['id'],
-                title=info['title'],
-                url=info['webpage_url'],
-                duration=info.get('duration', 0),
-                upload_date=info.get('upload_date'),
-                audio_file=audio_file,
-                thumbnail=str(thumbnail_path) if thumbnail_path.exists() else None
-            )
+        return DownloadedVideo(
+            video_id=info['id'],
+            title=info['title'],
+            url=info['webpage_url'],
+            duration=info.get('duration', 0),
+            upload_date=info.get('upload_date'),
+            audio_file=audio_file,
+            thumbnail=str(thumbnail_path) if SAVE_METADATA and thumbnail_path.exists() else None
+        )
 
     except Exception as e:
         print(f"  Error downloading video: {e}")
         return None
-    finally:
-        # Clean up cookies file
-        if cookies_file and os.path.exists(cookies_file):
-            try:
-                os.remove(cookies_file)
-            except:
-                pass
 
 
 # Transcription utilities
+class RateLimiter:
+    """Limit requests per rolling minute and requests in flight, shared across threads."""
+
+    def __init__(self, rpm: int, concurrency: int):
+        self.rpm = rpm
+        self._slots = threading.Semaphore(concurrency)
+        self._lock = threading.Lock()
+        self._sent = deque()
+
+    def __enter__(self) -> "RateLimiter":
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    while self._sent and now - self._sent[0] >= 60:
+                        self._sent.popleft()
+                    if len(self._sent) < self.rpm:
+                        self._sent.append(now)
+                        return self
+                    wait = 60 - (now - self._sent[0])
+                time.sleep(wait)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        self._slots.release()
+
+
+# Every Whisper call from any creator, video or chunk thread goes through this
+WHISPER_RATE_LIMITER = RateLimiter(WHISPER_RPM, WHISPER_CONCURRENCY)
+
+
 def create_openai_client(api_key: str) -> OpenAI:
-    """Create OpenAI client."""
-    return OpenAI(api_key=api_key)
+    """Create OpenAI client, shared by all worker threads."""
+    # One HTTP/2 pool sized to the Whisper concurrency keeps TLS connections alive across chunks and videos
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=WHISPER_CONCURRENCY, max_keepalive_connections=WHISPER_CONCURRENCY),
+        timeout=WHISPER_TIMEOUT_SECONDS
+    )
+    return OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, http_client=http_client)
 
 
 def get_audio_duration(audio_file: str) -> float:
-    """Get duration of audio file in seconds using ffprobe."""
+    """Get duration of audio file in seconds from the container header, falling back to ffprobe."""
+    try:
+        with av.open(audio_file) as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except Exception as e:
+        print(f"  Could not read duration from container header: {e}")
+
     try:
         result = subprocess.run(
             [
@@ -339,53 +608,115 @@ def get_audio_duration(audio_file: str) -> float:
         return 0
 
 
-def split_audio_file(audio_file: str, chunk_duration_minutes: int = 20) -> List[str]:
-    """Split audio file into chunks of specified duration."""
+def split_audio_stream_copy(audio_file: str, chunk_duration_seconds: int) -> List[str]:
+    """Split audio into chunks in-process by copying packets with PyAV, without re-encoding."""
     audio_path = Path(audio_file)
-    file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+    chunks = []
 
-    print(f"  Audio file size: {file_size_mb:.2f} MB")
+    with av.open(audio_file) as source:
+        in_stream = source.streams.audio[0]
+        output = None
+        out_stream = None
+        chunk_start_pts = 0
 
-    if file_size_mb <= MAX_AUDIO_SIZE_MB:
-        return [audio_file]
+        try:
+            for packet in source.demux(in_stream):
+                # Flush packets carry no data and no timestamps
+                if packet.dts is None or packet.pts is None:
+                    continue
+
+                position = float(packet.pts * in_stream.time_base)
+                if output is None or position >= len(chunks) * chunk_duration_seconds:
+                    if output is not None:
+                        output.close()
+                    chunk_file = audio_path.parent / f"{audio_path.stem}_chunk_{len(chunks):03d}{audio_path.suffix}"
+                    output = av.open(str(chunk_file), 'w')
+                    out_stream = output.add_stream_from_template(in_stream)
+                    chunk_start_pts = packet.pts
+                    chunks.append(str(chunk_file))
+
+                # Restart timestamps at zero in every chunk
+                packet.pts -= chunk_start_pts
+                packet.dts -= chunk_start_pts
+                packet.stream = out_stream
+                output.mux(packet)
+        except Exception:
+            # Don't leave partial chunks behind for the ffmpeg fallback to pick up
+            if output is not None:
+                output.close()
+                output = None
+            for chunk_file in chunks:
+                Path(chunk_file).unlink(missing_ok=True)
+            raise
+        finally:
+            if output is not None:
+                output.close()
+
+    return chunks
+
+
+def split_audio_file_ffmpeg(audio_file: str, chunk_duration_seconds: int) -> List[str]:
+    """Split audio into chunks with a single ffmpeg segment-muxer pass."""
+    audio_path = Path(audio_file)
 
-    print(f"  File exceeds {MAX_AUDIO_SIZE_MB} MB limit. Splitting into chunks...")
+    # One pass with the segment muxer writes every chunk, instead of re-reading the file per chunk
+    chunk_pattern = audio_path.parent / f"{audio_path.stem}_chunk_%03d{audio_path.suffix}"
+    try:
+        subprocess.run(
+            [
+                'ffmpeg',
+                '-i', audio_file,
+                '-f', 'segment',
+                '-segment_time', str(chunk_duration_seconds),
+                '-reset_timestamps', '1',
+                '-c', 'copy',
+                '-y',
+                str(chunk_pattern)
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True
+        )
+    except Exception as e:
+        print(f"  Error splitting audio: {e}")
+        return []
+
+    return [
+        str(chunk_file)
+        for chunk_file in sorted(audio_path.parent.glob(f"{audio_path.stem}_chunk_[0-9][0-9][0-9]{audio_path.suffix}"))
+    ]
 
-    duration = get_audio_duration(audio_file)
-    if duration == 0:
+
+def split_audio_file(
+    audio_file: str,
+    chunk_duration_minutes: int = 20,
+    duration: Optional[float] = None
+) -> List[str]:
+    """Split audio file into chunks of specified duration. Probes the duration only if it isn't known."""
+    if not duration:
+        duration = get_audio_duration(audio_file)
+    if not duration:
         print("  Warning: Could not determine audio duration")
         return [audio_file]
 
     chunk_duration_seconds = chunk_duration_minutes * 60
-    num_chunks = int(duration / chunk_duration_seconds) + 1
 
     print(f"  Total duration: {duration/60:.1f} minutes")
-    print(f"  Creating {num_chunks} chunks of ~{chunk_duration_minutes} minutes each")
+    print(f"  Creating chunks of ~{chunk_duration_minutes} minutes each")
 
+    # Copy packets into chunks in-process; fall back to one ffmpeg segment-muxer pass
     chunks = []
-    for i in range(num_chunks):
-        start_time = i * chunk_duration_seconds
-        chunk_file = audio_path.parent / f"{audio_path.stem}_chunk_{i+1}{audio_path.suffix}"
+    try:
+        chunks = split_audio_stream_copy(audio_file, chunk_duration_seconds)
+    except Exception as e:
+        print(f"  Could not split audio in-process, using ffmpeg: {e}")
 
-        try:
-            subprocess.run(
-                [
-                    'ffmpeg',
-                    '-i', audio_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration_seconds),
-                    '-c', 'copy',
-                    '-y',
-                    str(chunk_file)
-                ],
-                capture_output=True,
-                check=True
-            )
-            chunks.append(str(chunk_file))
-            chunk_size_mb = chunk_file.stat().st_size / (1024 * 1024)
-            print(f"  Created chunk {i+1}/{num_chunks}: {chunk_size_mb:.2f} MB")
-        except Exception as e:
-            print(f"  Error creating chunk {i+1}: {e}")
+    if not chunks:
+        chunks = split_audio_file_ffmpeg(audio_file, chunk_duration_seconds)
+
+    for i, chunk_file in enumerate(chunks, 1):
+        chunk_size_mb = Path(chunk_file).stat().st_size / (1024 * 1024)
+        print(f"  Created chunk {i}/{len(chunks)}: {chunk_size_mb:.2f} MB")
 
     return chunks if chunks else [audio_file]
 
@@ -393,18 +724,27 @@ def split_audio_file(audio_file: str, chunk_duration_minutes: int = 20) -> List[
 def generate_transcript(
     audio_file: str,
     video_title: str,
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    delete_after_open: bool = False
 ) -> Optional[TranscriptData]:
     """Generate transcript using OpenAI Whisper."""
     print(f"  Transcribing: {video_title}")
 
     try:
-        with open(audio_file, 'rb') as audio:
+        with WHISPER_RATE_LIMITER, open(audio_file, 'rb') as audio:
+            if delete_after_open:
+                # The open handle keeps the data readable, retries included, until it closes;
+                # where open files can't be unlinked the caller deletes it afterwards
+                try:
+                    os.remove(audio_file)
+                except OSError:
+                    pass
+
             transcript = openai_client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio,
                 response_format="verbose_json",
-                timestamp_granularities=["segment", "word"]
+                timestamp_granularities=["segment", "word"] if WORD_TIMESTAMPS else ["segment"]
             )
 
         # Convert to dict
@@ -430,7 +770,6 @@ def merge_transcripts(chunk_transcripts: List[TranscriptData], chunk_duration_mi
     if len(chunk_transcripts) == 1:
         return chunk_transcripts[0]
 
-    merged_text = ""
     merged_segments = []
     merged_words = []
     total_duration = 0
@@ -439,30 +778,23 @@ def merge_transcripts(chunk_transcripts: List[TranscriptData], chunk_duration_mi
     for chunk_idx, chunk in enumerate(chunk_transcripts):
         time_offset = chunk_idx * chunk_duration_seconds
 
-        # Add text with space
-        if merged_text:
-            merged_text += " "
-        merged_text += chunk.text
-
-        # Adjust segment timestamps
+        # Adjust segment timestamps in place; chunk transcripts are discarded after merging
         for segment in chunk.segments:
-            adjusted_segment = segment.copy()
-            adjusted_segment['start'] = segment['start'] + time_offset
-            adjusted_segment['end'] = segment['end'] + time_offset
-            merged_segments.append(adjusted_segment)
+            segment['start'] += time_offset
+            segment['end'] += time_offset
+        merged_segments.extend(chunk.segments)
 
         # Adjust word timestamps if available
         if chunk.words:
             for word in chunk.words:
-                adjusted_word = word.copy()
-                adjusted_word['start'] = word['start'] + time_offset
-                adjusted_word['end'] = word['end'] + time_offset
-                merged_words.append(adjusted_word)
+                word['start'] += time_offset
+                word['end'] += time_offset
+            merged_words.extend(chunk.words)
 
         total_duration = max(total_duration, chunk.duration + time_offset)
 
     return TranscriptData(
-        text=merged_text,
+        text=" ".join(chunk.text for chunk in chunk_transcripts),
         language=chunk_transcripts[0].language,
         duration=total_duration,
         segments=merged_segments,
@@ -470,111 +802,181 @@ def merge_transcripts(chunk_transcripts: List[TranscriptData], chunk_duration_mi
     )
 
 
+def transcribe_chunk(
+    chunk_file: str,
+    chunk_idx: int,
+    total_chunks: int,
+    video_title: str,
+    openai_client: OpenAI
+) -> Optional[TranscriptData]:
+    """Transcribe one audio chunk, deleting its file as soon as the upload has it open."""
+    print(f"  Transcribing chunk {chunk_idx}/{total_chunks}...")
+    transcript = generate_transcript(
+        chunk_file,
+        f"{video_title} (chunk {chunk_idx})",
+        openai_client,
+        delete_after_open=True
+    )
+
+    if not transcript:
+        print(f"  Warning: Failed to transcribe chunk {chunk_idx}")
+
+    # Clean up chunk file if it wasn't already unlinked during the upload
+    try:
+        os.remove(chunk_file)
+        print(f"  Cleaned up chunk {chunk_idx}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"  Warning: Could not delete chunk file: {e}")
+
+    return transcript
+
+
 def generate_transcript_with_chunking(
     audio_file: str,
     video_title: str,
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    duration: Optional[float] = None
 ) -> Optional[TranscriptData]:
     """Generate transcript with automatic chunking for large files."""
-    # Split audio if needed
-    chunk_files = split_audio_file(audio_file, CHUNK_DURATION_MINUTES)
+    # Files under the Whisper limit go straight to transcription; a stat is all it takes
+    file_size_mb = os.path.getsize(audio_file) / (1024 * 1024)
+    if file_size_mb <= MAX_AUDIO_SIZE_MB:
+        return generate_transcript(audio_file, video_title, openai_client)
+
+    print(f"  Audio file is {file_size_mb:.2f} MB, exceeding the {MAX_AUDIO_SIZE_MB} MB limit. Splitting into chunks...")
+    chunk_files = split_audio_file(audio_file, CHUNK_DURATION_MINUTES, duration)
 
     if len(chunk_files) == 1:
-        # Single file, use normal transcription
+        # Splitting failed, so try the whole file
         return generate_transcript(audio_file, video_title, openai_client)
 
-    # Multiple chunks - transcribe each
+    # Multiple chunks - transcribe them concurrently
     print(f"  Transcribing {len(chunk_files)} chunks for: {video_title}")
-    chunk_transcripts = []
 
-    for idx, chunk_file in enumerate(chunk_files, 1):
-        print(f"  Transcribing chunk {idx}/{len(chunk_files)}...")
-        transcript = generate_transcript(chunk_file, f"{video_title} (chunk {idx})", openai_client)
-
-        if transcript:
-            chunk_transcripts.append(transcript)
-        else:
-            print(f"  Warning: Failed to transcribe chunk {idx}")
-
-        # Clean up chunk file
-        try:
-            if chunk_file != audio_file:  # Don't delete original
-                os.remove(chunk_file)
-                print(f"  Cleaned up chunk {idx}")
-        except Exception as e:
-            print(f"  Warning: Could not delete chunk file: {e}")
-
-    if not chunk_transcripts:
-        print("  Error: No chunks were successfully transcribed")
+    with ThreadPoolExecutor(max_workers=CHUNK_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                transcribe_chunk,
+                chunk_file,
+                idx,
+                len(chunk_files),
+                video_title,
+                openai_client
+            )
+            for idx, chunk_file in enumerate(chunk_files, 1)
+        ]
+        # Keep chunk order; merge_transcripts offsets timestamps by position
+        results = [future.result() for future in futures]
+
+    # Dropping a failed chunk would shift every later chunk back and leave a gap, so fail the video;
+    # the source audio is kept and the video is retried on the next run
+    failed_chunks = sum(1 for transcript in results if not transcript)
+    if failed_chunks:
+        print(f"  Error: {failed_chunks}/{len(results)} chunks failed to transcribe")
         return None
 
     # Merge all transcripts
-    print(f"  Merging {len(chunk_transcripts)} transcript chunks...")
-    merged = merge_transcripts(chunk_transcripts, CHUNK_DURATION_MINUTES)
+    print(f"  Merging {len(results)} transcript chunks...")
+    merged = merge_transcripts(results, CHUNK_DURATION_MINUTES)
     print(f"  Merge complete! Total duration: {merged.duration/60:.1f} minutes")
 
     return merged
 
 
 # File I/O utilities
-def save_transcript_json(
-    transcript: TranscriptData,
-    video_info: DownloadedVideo,
-    creator_dir: Path
-) -> str:
-    """Save transcript to JSON file."""
-    transcripts_dir = creator_dir / "transcripts"
-    transcripts_dir.mkdir(exist_ok=True)
-
-    json_file = transcripts_dir / f"{video_info.video_id}_transcript.json"
-
-    transcript_data = {
+def build_transcript_metadata(video_info: DownloadedVideo) -> Dict:
+    """Build the video fields of a transcript record."""
+    return {
         'video_id': video_info.video_id,
         'title': video_info.title,
         'url': video_info.url,
         'duration': video_info.duration,
-        'upload_date': video_info.upload_date,
-        'transcript': transcript.dict()
+        'upload_date': video_info.upload_date
     }
 
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(transcript_data, f, indent=2, ensure_ascii=False)
 
-    print(f"  Saved transcript: {json_file}")
-    return str(json_file)
+def build_transcript_record(transcript: TranscriptData, video_info: DownloadedVideo) -> Dict:
+    """Build the transcript record that is ingested into RAG."""
+    record = build_transcript_metadata(video_info)
+    # Shallow field view; segments and words are shared with the model, not copied
+    record['transcript'] = dict(transcript)
+    return record
+
 
+def build_transcript_json(transcript: TranscriptData, video_info: DownloadedVideo) -> bytes:
+    """Serialize the transcript record to JSON bytes."""
+    # Serialize the transcript straight from the model instead of dumping it to a dict first
+    metadata_json = orjson.dumps(build_transcript_metadata(video_info))
+    return metadata_json[:-1] + b', "transcript": ' + transcript.model_dump_json().encode('utf-8') + b'}'
 
-def create_readable_transcript(
+
+def build_readable_transcript(transcript: TranscriptData, video_info: DownloadedVideo) -> str:
+    """Build a human-readable text version of the transcript."""
+    header = (
+        f"Video: {video_info.title}\n"
+        f"URL: {video_info.url}\n"
+        f"Duration: {video_info.duration / 60:.1f} minutes\n"
+        + "="*80 + "\n\n"
+    )
+
+    lines = [
+        f"[{int(segment.get('start', 0) // 60):02d}:{int(segment.get('start', 0) % 60):02d}] "
+        f"{segment.get('text', '').strip()}\n\n"
+        for segment in transcript.segments
+    ]
+    return header + "".join(lines)
+
+
+def write_transcript_artifacts(
     transcript: TranscriptData,
     video_info: DownloadedVideo,
-    creator_dir: Path
-) -> None:
-    """Create a human-readable text version of the transcript."""
+    creator_dir: Path,
+    write_readable: bool = True
+) -> str:
+    """Write the zstd-compressed JSON transcript and, optionally, its readable text version."""
     transcripts_dir = creator_dir / "transcripts"
-    txt_file = transcripts_dir / f"{video_info.video_id}_readable.txt"
+    transcripts_dir.mkdir(exist_ok=True)
 
-    with open(txt_file, 'w', encoding='utf-8') as f:
-        f.write(f"Video: {video_info.title}\n")
-        f.write(f"URL: {video_info.url}\n")
-        f.write(f"Duration: {video_info.duration / 60:.1f} minutes\n")
-        f.write("="*80 + "\n\n")
+    json_file = transcripts_dir / f"{video_info.video_id}_transcript.json.zst"
+    with open(json_file, 'wb') as f:
+        f.write(zstd.ZstdCompressor(level=TRANSCRIPT_ZSTD_LEVEL).compress(
+            build_transcript_json(transcript, video_info)
+        ))
+    print(f"  Saved transcript: {json_file}")
 
-        for segment in transcript.segments:
-            start = segment.get('start', 0)
-            minutes = int(start // 60)
-            seconds = int(start % 60)
-            timestamp = f"[{minutes:02d}:{seconds:02d}]"
-            text = segment.get('text', '').strip()
-            f.write(f"{timestamp} {text}\n\n")
+    if write_readable:
+        txt_file = transcripts_dir / f"{video_info.video_id}_readable.txt"
+        txt_file.write_text(build_readable_transcript(transcript, video_info), encoding='utf-8')
+        print(f"  Saved readable transcript: {txt_file}")
 
-    print(f"  Saved readable transcript: {txt_file}")
+    return str(json_file)
 
 
 def cleanup_audio_file(audio_file: str) -> None:
     """Remove audio file to save space."""
-    if os.path.exists(audio_file):
+    try:
         os.remove(audio_file)
         print(f"  Cleaned up audio file")
+    except FileNotFoundError:
+        pass
+
+
+def get_transcribed_video_ids(creator_dir: Path) -> Set[str]:
+    """Get IDs of videos that already have a non-empty transcript JSON on disk."""
+    transcripts_dir = creator_dir / "transcripts"
+    if not transcripts_dir.is_dir():
+        return set()
+
+    # Older runs wrote plain .json, newer ones write .json.zst
+    video_ids = set()
+    for suffix in ("_transcript.json", "_transcript.json.zst"):
+        for path in transcripts_dir.glob(f"*{suffix}"):
+            if path.stat().st_size > 0:
+                video_ids.add(path.name[:-len(suffix)])
+
+    return video_ids
 
 
 # Processing workflows
@@ -584,6 +986,14 @@ def process_single_video(
     openai_client: OpenAI
 ) -> bool:
     """Process a single video: download, transcribe, save."""
+    # Skip videos transcribed by an earlier run
+    transcripts_dir = creator_dir / "transcripts"
+    for suffix in ("_transcript.json.zst", "_transcript.json"):
+        transcript_file = transcripts_dir / f"{video.id}{suffix}"
+        if transcript_file.exists() and transcript_file.stat().st_size > 0:
+            print(f"  Already transcribed, skipping: {video.title}")
+            return True
+
     # Download video
     video_info = download_video_audio(video.url, creator_dir)
     if not video_info:
@@ -593,14 +1003,14 @@ def process_single_video(
     transcript = generate_transcript_with_chunking(
         video_info.audio_file,
         video_info.title,
-        openai_client
+        openai_client,
+        video_info.duration  # Known from yt-dlp, so no probe is needed
     )
     if not transcript:
         return False
 
     # Save transcript files
-    save_transcript_json(transcript, video_info, creator_dir)
-    create_readable_transcript(transcript, video_info, creator_dir)
+    write_transcript_artifacts(transcript, video_info, creator_dir)
 
     # Clean up audio file
     cleanup_audio_file(video_info.audio_file)
@@ -629,12 +1039,29 @@ def process_creator(
     videos = get_channel_videos(creator_info['url'], max_videos)
     print(f"Found {len(videos)} videos")
 
-    processed_count = 0
-    for idx, video in enumerate(videos, 1):
-        print(f"\nVideo {idx}/{len(videos)}: {video.title}")
-
-        if process_single_video(video, creator_dir, openai_client):
-            processed_count += 1
+    # Drop videos with a transcript on disk before any yt-dlp work is queued
+    transcribed_ids = get_transcribed_video_ids(creator_dir)
+    already_done = sum(1 for video in videos if video.id in transcribed_ids)
+    if already_done:
+        print(f"Skipping {already_done} already transcribed videos")
+        pending_videos = [video for video in videos if video.id not in transcribed_ids]
+    else:
+        pending_videos = videos
+
+    # Downloads and Whisper calls are network-bound, so overlap them across videos
+    processed_count = already_done
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for idx, video in enumerate(pending_videos, 1):
+            print(f"\nVideo {idx}/{len(pending_videos)}: {video.title}")
+            futures[executor.submit(process_single_video, video, creator_dir, openai_client)] = video
+
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    processed_count += 1
+            except Exception as e:
+                print(f"Error processing {futures[future].title}: {e}")
 
     print(f"\nProcessed {processed_count}/{len(videos)} videos for {creator_name}")
     return processed_count
@@ -653,32 +1080,46 @@ def process_all_creators(
 
     openai_client = create_openai_client(openai_api_key)
 
-    summary = ProcessingSummary(
-        total_creators=len(creators),
-        total_videos_processed=0,
-        creators_processed={},
-        timestamp=datetime.now().isoformat()
-    )
+    started_at = datetime.now().isoformat()
+    creators_processed = {}
 
-    for creator_name, creator_info in creators.items():
-        try:
-            count = process_creator(
+    # Creators are independent, so process them concurrently; results are only
+    # collected from this thread as they complete
+    with ThreadPoolExecutor(max_workers=max(len(creators), 1)) as executor:
+        futures = {
+            executor.submit(
+                process_creator,
                 creator_name,
                 creator_info,
                 output_dir,
                 openai_client,
                 max_videos_per_creator
-            )
-            summary.creators_processed[creator_name] = count
-            summary.total_videos_processed += count
-        except Exception as e:
-            print(f"Error processing {creator_name}: {e}")
-            summary.creators_processed[creator_name] = 0
+            ): creator_name
+            for creator_name, creator_info in creators.items()
+        }
+
+        for future in as_completed(futures):
+            creator_name = futures[future]
+            try:
+                creators_processed[creator_name] = future.result()
+            except Exception as e:
+                print(f"Error processing {creator_name}: {e}")
+                creators_processed[creator_name] = 0
+
+    # We passed in the HTTP/2 pool, so the SDK won't close it on its own
+    openai_client.close()
+
+    summary = ProcessingSummary(
+        total_creators=len(creators),
+        total_videos_processed=sum(creators_processed.values()),
+        creators_processed=creators_processed,
+        timestamp=started_at
+    )
 
     # Save summary
     summary_file = output_dir / "processing_summary.json"
-    with open(summary_file, 'w') as f:
-        json.dump(summary.dict(), f, indent=2)
+    with open(summary_file, 'wb') as f:
+        f.write(orjson.dumps(summary.model_dump(), option=orjson.OPT_INDENT_2))
 
     print(f"\n{'='*80}")
     print("PROCESSING COMPLETE")
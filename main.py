@@ -5,19 +5,27 @@ Handles vector search, chat queries, and document management
 """
 
 import os
-import json
+import asyncio
+import sqlite3
+import time
+from array import array
+import httpx
 import mmh3
+import orjson
 from contextlib import asynccontextmanager
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Optional
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 
-from pymilvus import MilvusClient
+import numpy as np
+from pymilvus import MilvusClient, DataType
 import openai
 from dotenv import load_dotenv
 
@@ -29,12 +37,62 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MILVUS_URI = os.getenv("MILVUS_URI")
 MILVUS_TOKEN = os.getenv("MILVUS_TOKEN")
 COLLECTION_NAME = "music_production_tutorials"
+ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:8000").split(",")  # Comma-separated browser origins allowed by CORS
+MAX_DOCUMENTS_PER_REQUEST = 128  # Keep batches under the Milvus gRPC message size limit
+EMBEDDING_MODEL = "text-embedding-3-large"
+EMBEDDING_DIMENSION = 3072  # text-embedding-3-large dimension
+VECTOR_DTYPE = os.getenv("VECTOR_DTYPE", "float16")  # Vector element type for newly created collections: float16 or float32
+MILVUS_INDEX_TYPE = os.getenv("MILVUS_INDEX_TYPE", "HNSW")  # Vector index for newly created collections; AUTOINDEX on Zilliz serverless
+HNSW_M = int(os.getenv("HNSW_M", "24"))  # Graph links per node
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))  # Candidate list size while building
+HNSW_MIN_EF = int(os.getenv("HNSW_MIN_EF", "64"))  # Smallest candidate list size at search time
+HNSW_MAX_EF = int(os.getenv("HNSW_MAX_EF", "512"))  # Largest candidate list size, bounding search latency
+HNSW_EF_PER_RESULT = int(os.getenv("HNSW_EF_PER_RESULT", "16"))  # Candidates searched per requested result
+EMBEDDING_BATCH_SIZE = 256  # Texts per embeddings request (OpenAI accepts up to 2048)
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "8"))  # Embedding requests in flight at once
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))  # Retries with exponential backoff on 429s and 5xx
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30"))  # Per-request timeout for OpenAI calls
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))  # Connection pool size shared by all handlers
+EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB", "embedding_cache.db")  # SQLite file holding cached query embeddings
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_MAX_CACHE_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000"))  # Least recently used entries are evicted past this
+
+# Initialize OpenAI client (async, so API calls don't block the event loop)
+openai_client = openai.AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    max_retries=OPENAI_MAX_RETRIES,
+    timeout=OPENAI_TIMEOUT_SECONDS,
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=20),
+        timeout=OPENAI_TIMEOUT_SECONDS
+    )
+)
+
+# Limits concurrent embedding requests to stay under OpenAI rate limits
+EMBEDDING_SEMAPHORE = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+# Prompt templates (built once at import; only the context changes per request)
+SYSTEM_PROMPT_PREFIX = """You are an AI assistant specialized in music production tutorials.
+Use the following context from music production YouTube videos to answer the user's question.
+Include specific techniques, DAW names, and plugin references when mentioned.
+
+Format your response with proper markdown for readability:
+- Use **bold** for important terms, DAW names, and plugin names
+- Use bullet points or numbered lists when listing multiple items
+- Use `code blocks` for technical settings or parameters
+- Break up long paragraphs into shorter, digestible sections
+- Use headers (##) for distinct sections if needed
 
-# Initialize OpenAI client
-openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+Context:
+"""
 
 # Global state
 _milvus_client: Optional[MilvusClient] = None
+_embedding_cache: Optional[sqlite3.Connection] = None
+# Vector element type of the open collection, detected at startup so older float32 collections keep working
+_collection_vector_dtype: str = VECTOR_DTYPE
+# Index type of the open collection; search parameters depend on it
+_collection_index_type: str = MILVUS_INDEX_TYPE
 
 
 # Pydantic Models
@@ -46,6 +104,7 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     message: str = Field(..., max_length=1000)
     conversation_history: List[ChatMessage] = Field(default_factory=list, max_items=20)
+    ef: Optional[int] = Field(None, ge=1, le=HNSW_MAX_EF)  # Overrides the adaptive HNSW ef for tuning
 
 
 class SearchResult(BaseModel):
@@ -70,6 +129,22 @@ class AddDocumentResponse(BaseModel):
     status: str
 
 
+class AddDocumentsRequest(BaseModel):
+    documents: List[AddDocumentRequest] = Field(..., max_items=MAX_DOCUMENTS_PER_REQUEST)
+
+
+class AddDocumentsResponse(BaseModel):
+    message: str
+    status: str
+    added: int
+    duplicates: int
+
+
+class FlushResponse(BaseModel):
+    message: str
+    status: str
+
+
 class HealthResponse(BaseModel):
     status: str
     milvus_connected: bool
@@ -87,62 +162,232 @@ def get_milvus_client() -> Optional[MilvusClient]:
 
 
 def create_milvus_collection(client: MilvusClient, collection_name: str) -> None:
-    """Create Milvus collection using simplified API."""
-    # MilvusClient simplified API for serverless
+    """Create Milvus collection with an explicit schema for the configured vector type."""
+    # text and metadata stay dynamic fields, as with the simplified API
+    schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=True)
+    schema.add_field(field_name="id", datatype=DataType.INT64, is_primary=True)
+    # A real field rather than a dynamic one, so it can carry the scalar index below
+    schema.add_field(field_name="channel_name", datatype=DataType.VARCHAR, max_length=256)
+    schema.add_field(
+        field_name="vector",
+        # Half precision halves vector memory with negligible recall loss
+        datatype=DataType.FLOAT16_VECTOR if VECTOR_DTYPE == "float16" else DataType.FLOAT_VECTOR,
+        dim=EMBEDDING_DIMENSION
+    )
+
+    index_params = client.prepare_index_params()
+    if MILVUS_INDEX_TYPE == "HNSW":
+        index_params.add_index(
+            field_name="vector",
+            index_type="HNSW",
+            metric_type="COSINE",
+            params={"M": HNSW_M, "efConstruction": HNSW_EF_CONSTRUCTION}
+        )
+    else:
+        index_params.add_index(field_name="vector", index_type=MILVUS_INDEX_TYPE, metric_type="COSINE")
+    # Channel filters are resolved from the inverted index before the vector search
+    index_params.add_index(field_name="channel_name", index_type="INVERTED")
+
     client.create_collection(
         collection_name=collection_name,
-        dimension=3072,  # text-embedding-3-large dimension
-        metric_type="COSINE",
-        id_type="int",
-        max_length=65535
+        schema=schema,
+        index_params=index_params
     )
 
     print(f"Collection '{collection_name}' created successfully")
 
 
-async def generate_embedding(text: str) -> List[float]:
-    """Generate embedding using OpenAI API."""
-    try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-3-large",
-            input=text
+def get_collection_vector_dtype(client: MilvusClient, collection_name: str) -> str:
+    """Detect whether a collection stores float16 or float32 vectors."""
+    description = client.describe_collection(collection_name=collection_name)
+    for field in description.get("fields", []):
+        if field.get("name") == "vector" and field.get("type") == DataType.FLOAT16_VECTOR:
+            return "float16"
+    return "float32"
+
+
+def get_collection_index_type(client: MilvusClient, collection_name: str) -> str:
+    """Detect the index type of a collection's vector field."""
+    for index_name in client.list_indexes(collection_name=collection_name):
+        index = client.describe_index(collection_name=collection_name, index_name=index_name)
+        if index.get("field_name") == "vector":
+            return index.get("index_type", "AUTOINDEX")
+    return "AUTOINDEX"
+
+
+def build_search_params(limit: int, ef: Optional[int] = None) -> Dict[str, Any]:
+    """Build search parameters, widening the HNSW candidate list with the result count."""
+    if _collection_index_type == "HNSW":
+        # ef must be at least limit for HNSW to return limit results
+        ef = ef or min(max(HNSW_MIN_EF, limit * HNSW_EF_PER_RESULT), HNSW_MAX_EF)
+        return {"metric_type": "COSINE", "params": {"ef": max(ef, limit)}}
+    return {"metric_type": "COSINE"}
+
+
+def to_milvus_vector(embedding: List[float]) -> Any:
+    """Convert an embedding to the collection's vector element type."""
+    if _collection_vector_dtype == "float16":
+        return np.asarray(embedding, dtype=np.float16)
+    return embedding
+
+
+# Embedding cache utilities
+def get_embedding_cache() -> sqlite3.Connection:
+    """Get the embedding cache connection, creating the table on first use."""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        _embedding_cache = sqlite3.connect(EMBEDDING_CACHE_DB, check_same_thread=False)
+        _embedding_cache.execute("PRAGMA journal_mode=WAL")
+        with _embedding_cache:
+            _embedding_cache.execute("""
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            _embedding_cache.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache(last_used)"
+            )
+
+    return _embedding_cache
+
+
+def embedding_cache_key(text: str) -> str:
+    """Build the content-addressed cache key for a text under the current model."""
+    return f"{EMBEDDING_MODEL}:{mmh3.hash128(text):032x}"
+
+
+def get_cached_embedding(cache_key: str) -> Optional[List[float]]:
+    """Return a cached embedding that hasn't expired, or None."""
+    cache = get_embedding_cache()
+    now = time.time()
+
+    row = cache.execute(
+        "SELECT embedding FROM embedding_cache WHERE cache_key = ? AND created_at > ?",
+        (cache_key, now - EMBEDDING_CACHE_TTL_SECONDS)
+    ).fetchone()
+    if not row:
+        return None
+
+    with cache:
+        cache.execute("UPDATE embedding_cache SET last_used = ? WHERE cache_key = ?", (now, cache_key))
+
+    return array('f', row[0]).tolist()
+
+
+def store_cached_embedding(cache_key: str, embedding: List[float]) -> None:
+    """Cache an embedding as float32 bytes, evicting the least recently used entries past the limit."""
+    cache = get_embedding_cache()
+    now = time.time()
+
+    with cache:
+        cache.execute(
+            "INSERT OR REPLACE INTO embedding_cache (cache_key, embedding, created_at, last_used) VALUES (?, ?, ?, ?)",
+            (cache_key, array('f', embedding).tobytes(), now, now)
+        )
+        cache.execute("""
+            DELETE FROM embedding_cache WHERE last_used <= (
+                SELECT last_used FROM embedding_cache ORDER BY last_used DESC LIMIT 1 OFFSET ?
+            )
+        """, (DEFAULT_MAX_CACHE_ENTRIES,))
+
+
+async def embed_batch(texts: List[str]) -> Any:
+    """Request embeddings for one batch of texts, bounded by the shared semaphore."""
+    async with EMBEDDING_SEMAPHORE:
+        return await openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts
         )
-        return response.data[0].embedding
+
+
+async def generate_embeddings(texts: List[str]) -> List[List[float]]:
+    """Generate embeddings for multiple texts, EMBEDDING_BATCH_SIZE texts per OpenAI API call."""
+    try:
+        # Batches are independent, so send them concurrently; gather keeps them in order
+        responses = await asyncio.gather(*[
+            embed_batch(texts[start:start + EMBEDDING_BATCH_SIZE])
+            for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+        ])
+        return [
+            item.embedding
+            for response in responses
+            for item in sorted(response.data, key=lambda item: item.index)
+        ]
     except Exception as e:
-        print(f"Error generating embedding: {e}")
+        print(f"Error generating embeddings: {e}")
         raise HTTPException(
             status_code=500,
-            detail=f"Error generating embedding: {str(e)}"
+            detail=f"Error generating embeddings: {str(e)}"
         )
 
 
+async def generate_embedding(text: str) -> List[float]:
+    """Generate embedding for a single text, reusing a cached embedding of the same text."""
+    cache_key = embedding_cache_key(text)
+    try:
+        cached = get_cached_embedding(cache_key)
+        if cached:
+            return cached
+    except sqlite3.Error as e:
+        print(f"Error reading embedding cache: {e}")
+
+    embeddings = await generate_embeddings([text])
+
+    try:
+        store_cached_embedding(cache_key, embeddings[0])
+    except sqlite3.Error as e:
+        print(f"Error writing embedding cache: {e}")
+
+    return embeddings[0]
+
+
+@lru_cache(maxsize=10_000)
+def parse_metadata(metadata_str: str) -> Dict[str, Any]:
+    """Parse a segment's metadata JSON, memoized since stored metadata never changes."""
+    # The cached dict is shared between requests, so callers must not modify it
+    return orjson.loads(metadata_str)
+
+
 async def search_similar_segments(
     client: MilvusClient,
     collection_name: str,
     embedding: List[float],
     limit: int = 5,
-    channel_name: Optional[str] = None
+    channel_name: Optional[str] = None,
+    ef: Optional[int] = None
 ) -> List[SearchResult]:
     """Search Milvus for similar documents."""
-    filter_expr = f'channel_name == "{channel_name}"' if channel_name else None
+    # Quote and escape the value so a channel name can't change the filter expression
+    filter_expr = f'channel_name == {orjson.dumps(channel_name).decode()}' if channel_name else None
+
+    search_params = build_search_params(limit, ef)
 
     try:
+        started = time.perf_counter()
         results = client.search(
             collection_name=collection_name,
-            data=[embedding],
+            data=[to_milvus_vector(embedding)],
             limit=limit,
             filter=filter_expr,
+            search_params=search_params,
             output_fields=["text", "channel_name", "metadata"]
         )
+        # Logged so ef can be retuned against observed latency
+        print(f"Milvus search: {(time.perf_counter() - started) * 1000:.1f} ms, params={search_params.get('params', {})}")
 
         search_results = []
         for hit in results[0]:
             entity = hit.get("entity", {})
+            # Milvus returns our own stored fields, so skip pydantic validation
             search_results.append(
-                SearchResult(
+                SearchResult.model_construct(
                     text=entity.get("text", ""),
                     channel_name=entity.get("channel_name", ""),
-                    metadata=json.loads(entity.get("metadata", "{}")),
+                    metadata=parse_metadata(entity.get("metadata", "{}")),
                     score=hit.get("distance", 0)
                 )
             )
@@ -166,42 +411,38 @@ def format_context_from_results(results: List[SearchResult]) -> str:
     return "\n\n".join(context_parts)
 
 
-async def generate_chat_completion(
+def build_chat_messages(
     user_message: str,
     context: str,
     conversation_history: List[ChatMessage]
-) -> str:
-    """Generate response using GPT-3.5-turbo."""
-    try:
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are an AI assistant specialized in music production tutorials.
-Use the following context from music production YouTube videos to answer the user's question.
-Include specific techniques, DAW names, and plugin references when mentioned.
+) -> List[Dict[str, str]]:
+    """Build the chat completion messages from context, recent history and the user message."""
+    messages = [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT_PREFIX + context
+        }
+    ]
 
-Format your response with proper markdown for readability:
-- Use **bold** for important terms, DAW names, and plugin names
-- Use bullet points or numbered lists when listing multiple items
-- Use `code blocks` for technical settings or parameters
-- Break up long paragraphs into shorter, digestible sections
-- Use headers (##) for distinct sections if needed
+    # Add conversation history (last 10 messages)
+    messages.extend({"role": msg.role, "content": msg.content} for msg in conversation_history[-10:])
 
-Context:
-{context}"""
-            }
-        ]
+    # Add current message
+    messages.append({"role": "user", "content": user_message})
 
-        # Add conversation history (last 10 messages)
-        for msg in conversation_history[-10:]:
-            messages.append({"role": msg.role, "content": msg.content})
+    return messages
 
-        # Add current message
-        messages.append({"role": "user", "content": user_message})
 
-        response = openai_client.chat.completions.create(
+async def generate_chat_completion(
+    user_message: str,
+    context: str,
+    conversation_history: List[ChatMessage]
+) -> str:
+    """Generate response using GPT-3.5-turbo."""
+    try:
+        response = await openai_client.chat.completions.create(
             model="gpt-3.5-turbo",
-            messages=messages,
+            messages=build_chat_messages(user_message, context, conversation_history),
             max_tokens=500,
             temperature=0.7
         )
@@ -213,9 +454,40 @@ Context:
         return "I apologize, but I encountered an error generating a response. Please try again."
 
 
+async def stream_chat_completion(
+    user_message: str,
+    context: str,
+    conversation_history: List[ChatMessage]
+) -> AsyncIterator[str]:
+    """Stream a GPT-3.5-turbo response as it is generated, one content delta at a time."""
+    try:
+        stream = await openai_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=build_chat_messages(user_message, context, conversation_history),
+            max_tokens=500,
+            temperature=0.7,
+            stream=True
+        )
+
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    except Exception as e:
+        print(f"Error streaming chat response: {e}")
+        yield "I apologize, but I encountered an error generating a response. Please try again."
+
+
+def format_sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a payload as a server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+
 def calculate_text_hash(text: str) -> int:
-    """Calculate Murmur3 hash for text deduplication."""
-    return mmh3.hash(text, signed=False)
+    """Calculate 64-bit Murmur3 hash for text deduplication."""
+    # Signed, so it fits the INT64 primary key; 32 bits would collide within ~77k documents
+    return mmh3.hash64(text, signed=True)[0]
 
 
 async def insert_document(
@@ -225,43 +497,81 @@ async def insert_document(
     metadata_str: str
 ) -> AddDocumentResponse:
     """Add a document to the RAG system."""
-    # Hash text for deduplication
-    text_hash = calculate_text_hash(text)
-
-    # Check if exists
-    existing = client.query(
+    # Same dedup query, embedding and insert path as bulk uploads
+    response = await insert_documents(
+        client=client,
         collection_name=collection_name,
-        filter=f"id == {text_hash}",
-        output_fields=["id"]
+        documents=[AddDocumentRequest(text=text, metadata=metadata_str)]
     )
 
-    if existing:
+    if not response.added:
         return AddDocumentResponse(
             message="Document already exists",
             status="duplicate"
         )
 
-    # Generate embedding
-    embedding = await generate_embedding(text)
+    return AddDocumentResponse(
+        message="Document added successfully",
+        status="success"
+    )
+
 
-    # Parse metadata
-    metadata_dict = json.loads(metadata_str)
-    channel_name = metadata_dict.get("channel_name", "Unknown")
+async def insert_documents(
+    client: MilvusClient,
+    collection_name: str,
+    documents: List[AddDocumentRequest]
+) -> AddDocumentsResponse:
+    """Add a batch of documents to the RAG system with one embedding call and one insert."""
+    # Hash texts for deduplication, dropping repeats within the batch
+    unique_documents = {}
+    for document in documents:
+        unique_documents.setdefault(calculate_text_hash(document.text), document)
+
+    # Check which already exist
+    existing = client.query(
+        collection_name=collection_name,
+        filter=f"id in {list(unique_documents)}",
+        output_fields=["id"]
+    )
+    existing_ids = {row["id"] for row in existing}
+
+    new_documents = {
+        text_hash: document
+        for text_hash, document in unique_documents.items()
+        if text_hash not in existing_ids
+    }
+    duplicates = len(documents) - len(new_documents)
+
+    if not new_documents:
+        return AddDocumentsResponse(
+            message="All documents already exist",
+            status="duplicate",
+            added=0,
+            duplicates=duplicates
+        )
+
+    # Generate embeddings for the whole batch
+    embeddings = await generate_embeddings([document.text for document in new_documents.values()])
 
     # Insert into Milvus
-    data = [{
-        "id": text_hash,
-        "text": text,
-        "vector": embedding,
-        "channel_name": channel_name,
-        "metadata": metadata_str
-    }]
+    data = []
+    for (text_hash, document), embedding in zip(new_documents.items(), embeddings):
+        metadata_dict = orjson.loads(document.metadata)
+        data.append({
+            "id": text_hash,
+            "text": document.text,
+            "vector": to_milvus_vector(embedding),
+            "channel_name": metadata_dict.get("channel_name", "Unknown"),
+            "metadata": document.metadata
+        })
 
     client.insert(collection_name=collection_name, data=data)
 
-    return AddDocumentResponse(
-        message="Document added successfully",
-        status="success"
+    return AddDocumentsResponse(
+        message=f"Added {len(data)} documents",
+        status="success",
+        added=len(data),
+        duplicates=duplicates
     )
 
 
@@ -269,7 +579,7 @@ async def insert_document(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage startup and shutdown events."""
-    global _milvus_client
+    global _milvus_client, _collection_vector_dtype, _collection_index_type
 
     # Startup
     print("Starting up...")
@@ -286,6 +596,10 @@ async def lifespan(app: FastAPI):
         else:
             print(f"Collection '{COLLECTION_NAME}' already exists")
 
+        _collection_vector_dtype = get_collection_vector_dtype(_milvus_client, COLLECTION_NAME)
+        _collection_index_type = get_collection_index_type(_milvus_client, COLLECTION_NAME)
+        print(f"Collection vectors are {_collection_vector_dtype}, indexed with {_collection_index_type}")
+
     except Exception as e:
         print(f"Error connecting to Milvus: {e}")
         print("You need to set up Milvus. Sign up at https://cloud.zilliz.com")
@@ -298,23 +612,32 @@ async def lifespan(app: FastAPI):
         _milvus_client.close()
         print("Milvus connection closed")
 
+    if _embedding_cache:
+        _embedding_cache.close()
+
+    await openai_client.close()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Music Production Tutorial RAG API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware (a wildcard origin is rejected by browsers together with credentials)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
 )
 
+# Compress larger responses such as chat answers with their sources
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Mount static files and templates
 from pathlib import Path
 Path("static/css").mkdir(parents=True, exist_ok=True)
@@ -333,7 +656,7 @@ async def get_root(request: Request) -> HTMLResponse:
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def post_chat(request: ChatRequest) -> ChatResponse:
+async def post_chat(request: ChatRequest) -> ORJSONResponse:
     """Main chat endpoint for querying the RAG system."""
     client = get_milvus_client()
 
@@ -352,7 +675,8 @@ async def post_chat(request: ChatRequest) -> ChatResponse:
             client=client,
             collection_name=COLLECTION_NAME,
             embedding=embedding,
-            limit=5
+            limit=5,
+            ef=request.ef
         )
 
         # Format context
@@ -365,10 +689,11 @@ async def post_chat(request: ChatRequest) -> ChatResponse:
             conversation_history=request.conversation_history
         )
 
-        return ChatResponse(
-            response=response_text,
-            sources=results
-        )
+        # Returned directly so FastAPI doesn't re-validate trusted results against ChatResponse
+        return ORJSONResponse({
+            "response": response_text,
+            "sources": [result.model_dump() for result in results]
+        })
 
     except HTTPException:
         raise
@@ -377,6 +702,56 @@ async def post_chat(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/chat/stream")
+async def post_chat_stream(request: ChatRequest) -> StreamingResponse:
+    """Chat endpoint that streams the response as server-sent events."""
+    client = get_milvus_client()
+
+    if not client:
+        raise HTTPException(
+            status_code=503,
+            detail="Milvus not connected. Please configure MILVUS_URI and MILVUS_TOKEN in .env"
+        )
+
+    try:
+        # Retrieval runs before streaming starts, so its errors still return a normal status code
+        embedding = await generate_embedding(request.message)
+
+        results = await search_similar_segments(
+            client=client,
+            collection_name=COLLECTION_NAME,
+            embedding=embedding,
+            limit=5,
+            ef=request.ef
+        )
+
+        context = format_context_from_results(results)
+
+    except Exception as e:
+        print(f"Error in chat stream endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def event_generator() -> AsyncIterator[str]:
+        # Sources go first so the UI can render citations while tokens arrive
+        yield format_sse_event({"sources": [result.model_dump() for result in results]}, event="sources")
+
+        async for delta in stream_chat_completion(
+            user_message=request.message,
+            context=context,
+            conversation_history=request.conversation_history
+        ):
+            yield format_sse_event({"delta": delta})
+
+        yield format_sse_event({}, event="done")
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        # An explicit identity encoding keeps compression middleware from buffering events
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"}
+    )
+
+
 @app.post("/api/add-document", response_model=AddDocumentResponse)
 async def post_add_document(request: AddDocumentRequest) -> AddDocumentResponse:
     """Add a document to the RAG system."""
@@ -402,6 +777,67 @@ async def post_add_document(request: AddDocumentRequest) -> AddDocumentResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/add-documents", response_model=AddDocumentsResponse)
+async def post_add_documents(request: AddDocumentsRequest, flush: bool = False) -> AddDocumentsResponse:
+    """Add a batch of documents to the RAG system.
+
+    Inserts are not flushed by default; clients uploading a whole transcript
+    should call /api/flush once after the last batch instead.
+    """
+    client = get_milvus_client()
+
+    if not client:
+        raise HTTPException(
+            status_code=503,
+            detail="Milvus not connected"
+        )
+
+    if not request.documents:
+        return AddDocumentsResponse(
+            message="No documents provided",
+            status="success",
+            added=0,
+            duplicates=0
+        )
+
+    try:
+        response = await insert_documents(
+            client=client,
+            collection_name=COLLECTION_NAME,
+            documents=request.documents
+        )
+        if flush:
+            client.flush(COLLECTION_NAME)
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error adding documents: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/flush", response_model=FlushResponse)
+async def post_flush() -> FlushResponse:
+    """Seal pending inserts so they are persisted as one segment per upload."""
+    client = get_milvus_client()
+
+    if not client:
+        raise HTTPException(
+            status_code=503,
+            detail="Milvus not connected"
+        )
+
+    try:
+        client.flush(COLLECTION_NAME)
+        return FlushResponse(
+            message="Collection flushed",
+            status="success"
+        )
+    except Exception as e:
+        print(f"Error flushing collection: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/health", response_model=HealthResponse)
 async def get_health() -> HealthResponse:
     """Health check endpoint."""
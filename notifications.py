@@ -5,7 +5,14 @@ Send alerts via email, Slack, Discord, or webhook
 """
 
 import os
+import atexit
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Optional
 import smtplib
 from email.mime.text import MIMEText
@@ -17,6 +24,35 @@ from pydantic import BaseModel
 load_dotenv()
 
 
+def create_http_session(pool_size: int = 16) -> requests.Session:
+    """Create an HTTP session with connection pooling and retries for transient errors."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["POST"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session so repeated webhook calls reuse TCP/TLS connections
+_SESSION = create_http_session()
+
+# Shared pool so Slack, Discord and email are sent in parallel
+_NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="notify")
+NOTIFY_TIMEOUT_SECONDS = 15
+
+
+# Global state
+# SMTP connection reused across emails; the lock serializes access from worker threads
+_smtp_client: Optional[smtplib.SMTP] = None
+_smtp_lock = threading.Lock()
+
+
 # Pydantic Models
 class NotificationConfig(BaseModel):
     slack_webhook: Optional[str] = None
@@ -27,6 +63,17 @@ class NotificationConfig(BaseModel):
     sender_password: Optional[str] = None
     recipient_email: Optional[str] = None
 
+    @property
+    def email_enabled(self) -> bool:
+        """Whether all SMTP settings needed to send email are present."""
+        return all([self.smtp_server, self.sender_email,
+                    self.sender_password, self.recipient_email])
+
+    @property
+    def any_enabled(self) -> bool:
+        """Whether at least one notification channel is configured."""
+        return bool(self.slack_webhook or self.discord_webhook or self.email_enabled)
+
 
 class VideoInfo(BaseModel):
     creator: str
@@ -54,8 +101,9 @@ class SummaryInfo(BaseModel):
 
 
 # Configuration utilities
+@lru_cache(maxsize=1)
 def load_notification_config() -> NotificationConfig:
-    """Load notification configuration from environment variables."""
+    """Load notification configuration from environment variables (cached after the first call)."""
     return NotificationConfig(
         slack_webhook=os.getenv("SLACK_WEBHOOK_URL"),
         discord_webhook=os.getenv("DISCORD_WEBHOOK_URL"),
@@ -72,10 +120,7 @@ def format_creator_stats(by_creator: Dict[str, int]) -> str:
     if not by_creator:
         return "  (No data)"
 
-    lines = []
-    for creator, count in by_creator.items():
-        lines.append(f"  • {creator}: {count} videos")
-    return "\n".join(lines)
+    return "\n".join(f"  • {creator}: {count} videos" for creator, count in by_creator.items())
 
 
 # Notification senders
@@ -85,7 +130,7 @@ def send_slack_notification(webhook_url: str, title: str, message: str) -> bool:
         payload = {
             "text": f"*{title}*\n```{message}```"
         }
-        response = requests.post(
+        response = _SESSION.post(
             webhook_url,
             json=payload,
             timeout=10
@@ -104,7 +149,7 @@ def send_discord_notification(webhook_url: str, title: str, message: str) -> boo
         payload = {
             "content": f"**{title}**\n```{message}```"
         }
-        response = requests.post(
+        response = _SESSION.post(
             webhook_url,
             json=payload,
             timeout=10
@@ -117,14 +162,47 @@ def send_discord_notification(webhook_url: str, title: str, message: str) -> boo
         return False
 
 
+def get_smtp_client(config: NotificationConfig) -> smtplib.SMTP:
+    """Get the shared SMTP connection, reconnecting if the server dropped it."""
+    global _smtp_client
+
+    if _smtp_client is not None:
+        try:
+            if _smtp_client.noop()[0] == 250:
+                return _smtp_client
+        except (smtplib.SMTPException, OSError):
+            pass
+        close_smtp_client()
+
+    server = smtplib.SMTP(config.smtp_server, config.smtp_port, timeout=30)
+    server.starttls()
+    server.login(config.sender_email, config.sender_password)
+    _smtp_client = server
+    return server
+
+
+def close_smtp_client() -> None:
+    """Close the shared SMTP connection if it was opened."""
+    global _smtp_client
+
+    if _smtp_client is not None:
+        try:
+            _smtp_client.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        _smtp_client = None
+
+
+atexit.register(close_smtp_client)
+
+
 def send_email_notification(
     config: NotificationConfig,
     title: str,
     message: str
 ) -> bool:
     """Send email notification."""
-    if not all([config.smtp_server, config.sender_email,
-                config.sender_password, config.recipient_email]):
+    if not config.email_enabled:
         return False
 
     try:
@@ -135,10 +213,13 @@ def send_email_notification(
 
         msg.attach(MIMEText(message, 'plain'))
 
-        with smtplib.SMTP(config.smtp_server, config.smtp_port) as server:
-            server.starttls()
-            server.login(config.sender_email, config.sender_password)
-            server.send_message(msg)
+        with _smtp_lock:
+            try:
+                get_smtp_client(config).send_message(msg)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Drop the broken connection so the next email reconnects
+                close_smtp_client()
+                raise
 
         print(f"✅ Email notification sent: {title}")
         return True
@@ -156,71 +237,118 @@ def send_notification_to_all_channels(
     if not config:
         config = load_notification_config()
 
+    futures = []
+
     if config.slack_webhook:
-        send_slack_notification(config.slack_webhook, title, message)
+        futures.append(_NOTIFY_EXECUTOR.submit(
+            send_slack_notification, config.slack_webhook, title, message
+        ))
 
     if config.discord_webhook:
-        send_discord_notification(config.discord_webhook, title, message)
+        futures.append(_NOTIFY_EXECUTOR.submit(
+            send_discord_notification, config.discord_webhook, title, message
+        ))
 
-    if all([config.smtp_server, config.sender_email,
-            config.sender_password, config.recipient_email]):
-        send_email_notification(config, title, message)
+    if config.email_enabled:
+        futures.append(_NOTIFY_EXECUTOR.submit(
+            send_email_notification, config, title, message
+        ))
 
+    if futures:
+        wait(futures, timeout=NOTIFY_TIMEOUT_SECONDS)
 
-# Notification composers
-def notify_new_video(video_info: VideoInfo) -> None:
-    """Send notification about a new video being processed."""
-    title = "🎬 New Music Production Tutorial Processed"
-    message = f"""
+
+# Message templates (parsed once at import)
+_NEW_VIDEO_TEMPLATE = string.Template("""
 New music production tutorial added to database:
 
-Creator: {video_info.creator}
-Title: {video_info.title}
-Video ID: {video_info.id}
-URL: {video_info.url}
-Duration: {video_info.duration / 60:.1f} minutes
-Processed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Creator: $creator
+Title: $title
+Video ID: $video_id
+URL: $url
+Duration: $duration_minutes minutes
+Processed: $processed_at
 
 You can now search for content from this video in the RAG system!
-"""
+""")
+
+_ERROR_TEMPLATE = string.Template("""
+Error occurred during video processing:
+
+Creator: $creator
+Video: $video_title
+Video ID: $video_id
+Error: $error
+Occurred: $occurred_at
+
+Please check the logs for more details.
+""")
+
+_SUMMARY_TEMPLATE = string.Template("""
+Pipeline Summary Report
+Generated: $generated_at
+
+New videos processed: $new_videos
+Total in database: $total_videos
+RAG integrated: $rag_integrated
+Pending integration: $pending
+Errors: $errors
+
+By Creator:
+$creator_stats
+""")
+
+
+# Notification composers
+def notify_new_video(video_info: VideoInfo) -> None:
+    """Send notification about a new video being processed."""
+    # Skip composing (and timestamping) the message when nothing would be sent
+    if not load_notification_config().any_enabled:
+        return
+
+    title = "🎬 New Music Production Tutorial Processed"
+    message = _NEW_VIDEO_TEMPLATE.substitute(
+        creator=video_info.creator,
+        title=video_info.title,
+        video_id=video_info.id,
+        url=video_info.url,
+        duration_minutes=f"{video_info.duration / 60:.1f}",
+        processed_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
     send_notification_to_all_channels(title, message)
 
 
 def notify_error(error_info: ErrorInfo) -> None:
     """Send notification about a processing error."""
-    title = "❌ Pipeline Error"
-    occurred_at = error_info.occurred_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if not load_notification_config().any_enabled:
+        return
 
-    message = f"""
-Error occurred during video processing:
-
-Creator: {error_info.creator}
-Video: {error_info.video_title}
-Video ID: {error_info.video_id}
-Error: {error_info.error}
-Occurred: {occurred_at}
-
-Please check the logs for more details.
-"""
+    title = "❌ Pipeline Error"
+    message = _ERROR_TEMPLATE.substitute(
+        creator=error_info.creator,
+        video_title=error_info.video_title,
+        video_id=error_info.video_id,
+        error=error_info.error,
+        occurred_at=error_info.occurred_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
     send_notification_to_all_channels(title, message)
 
 
 def notify_summary(summary: SummaryInfo) -> None:
     """Send daily/weekly summary notification."""
-    title = "📊 Pipeline Summary Report"
-    message = f"""
-Pipeline Summary Report
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    if not load_notification_config().any_enabled:
+        return
 
-New videos processed: {summary.new_videos}
-Total in database: {summary.total_videos}
-RAG integrated: {summary.rag_integrated}
-Pending integration: {summary.pending}
-Errors: {summary.errors}
-
-By Creator:
-{format_creator_stats(summary.by_creator)}
-"""
+    title = "📊 Pipeline Summary Report"
+    message = _SUMMARY_TEMPLATE.substitute(
+        generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        new_videos=summary.new_videos,
+        total_videos=summary.total_videos,
+        rag_integrated=summary.rag_integrated,
+        pending=summary.pending,
+        errors=summary.errors,
+        creator_stats=format_creator_stats(summary.by_creator)
+    )
     send_notification_to_all_channels(title, message)
 
 
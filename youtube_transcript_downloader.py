@@ -5,15 +5,24 @@ Downloads videos from specified music production creators and generates transcri
 """
 
 import os
-import json
+import hashlib
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set
+import av
+import httpx
+import orjson
 import yt_dlp
+import zstandard as zstd
 from openai import OpenAI
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +33,22 @@ OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "music_tutorials"))
 MAX_VIDEOS_PER_CREATOR = 5
 MAX_AUDIO_SIZE_MB = 24  # Whisper API limit is 25 MB, use 24 to be safe
 CHUNK_DURATION_MINUTES = 20  # Duration of each audio chunk for large files
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "5"))  # Videos downloaded/transcribed concurrently per creator
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", "5"))  # Audio chunks of one video transcribed concurrently
+WORD_TIMESTAMPS = os.getenv("WORD_TIMESTAMPS", "0") == "1"  # Also request per-word timings from Whisper
+SAVE_METADATA = os.getenv("SAVE_METADATA", "0") == "1"  # Keep yt-dlp's info.json and thumbnail next to the audio
+TRANSCODE_AUDIO = os.getenv("TRANSCODE_AUDIO", "1") == "1"  # Re-encode downloads to small mono 16 kHz MP3 for Whisper
+TRANSCODE_BITRATE_KBPS = os.getenv("TRANSCODE_BITRATE_KBPS", "32")  # ~0.24 MB per minute, so ~100 minutes fit one request
+WHISPER_RPM = int(os.getenv("WHISPER_RPM", "50"))  # Whisper requests allowed per rolling minute
+WHISPER_CONCURRENCY = int(os.getenv("WHISPER_CONCURRENCY", "8"))  # Whisper requests in flight across all threads
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))  # Retries with exponential backoff on 429s and 5xx
+WHISPER_TIMEOUT_SECONDS = float(os.getenv("WHISPER_TIMEOUT_SECONDS", "600"))  # Per-request timeout for audio uploads
+TRANSCRIPT_ZSTD_LEVEL = 3  # Compression level for saved transcript JSON
+LISTING_PAGE_SIZE = 30  # Entries per yielded listing page, about one YouTube tab page of the single listing stream
+MAX_LISTING_ENTRIES = 100  # Stop paging a channel listing after this many entries
+PROBE_WORKERS = int(os.getenv("PROBE_WORKERS", "8"))  # Duration probes run concurrently for listing entries without one
+CHANNEL_CACHE_TTL_SECONDS = int(os.getenv("CHANNEL_CACHE_TTL_SECONDS", "3600"))  # How long a cached channel listing is reused
+REFRESH_CHANNEL_CACHE = os.getenv("REFRESH_CHANNEL_CACHE", "0") == "1"  # Ignore cached listings and fetch fresh ones
 
 # Music Production Creators Configuration
 CREATORS = {
@@ -39,13 +64,18 @@ CREATORS = {
 
 
 # Pydantic Models
+# Records are built once and only read afterwards, so they are frozen
 class VideoMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     url: str
 
 
 class DownloadedVideo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     video_id: str
     title: str
     url: str
@@ -56,6 +86,8 @@ class DownloadedVideo(BaseModel):
 
 
 class TranscriptData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     text: str
     language: str
     duration: float
@@ -64,15 +96,91 @@ class TranscriptData(BaseModel):
 
 
 class ProcessingSummary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     total_creators: int
     total_videos_processed: int
     creators_processed: Dict[str, int]
     timestamp: str
 
 
+# Global state
+# YoutubeDL instances aren't thread-safe, so each thread keeps its own downloaders and prober
+_thread_local = threading.local()
+
+
 # YouTube utilities
-def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetadata]:
-    """Fetch video metadata from a channel without downloading. Filters out YouTube Shorts."""
+def get_listing_entry_duration(entry: Dict) -> Optional[float]:
+    """Get a flat listing entry's duration without a network call, or None if the listing lacks it."""
+    if '/shorts/' in (entry.get('url') or ''):
+        return 0
+
+    return entry.get('duration')
+
+
+def get_duration_prober() -> yt_dlp.YoutubeDL:
+    """Get this thread's yt-dlp instance for probing video durations, creating it on first use."""
+    prober = getattr(_thread_local, "prober", None)
+    if prober is None:
+        prober = _thread_local.prober = yt_dlp.YoutubeDL({'quiet': True, 'skip_download': True})
+    return prober
+
+
+def probe_video_duration(video_id: str) -> Optional[float]:
+    """Fetch a single video's duration from its watch page."""
+    try:
+        info = get_duration_prober().extract_info(
+            f"https://www.youtube.com/watch?v={video_id}", download=False, process=False
+        )
+        return info.get('duration')
+    except Exception as e:
+        print(f"  Error probing video duration: {e}")
+        return None
+
+
+def build_listing_page(entries: List[Dict]) -> List[VideoMetadata]:
+    """Turn one page of flat listing entries into video metadata, dropping Shorts."""
+    durations = [get_listing_entry_duration(entry) for entry in entries]
+    unknown = [idx for idx, duration in enumerate(durations) if duration is None]
+    if unknown:
+        # Each probe is its own round trip to YouTube, so run them side by side
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(unknown))) as executor:
+            probed = executor.map(probe_video_duration, [entries[idx]['id'] for idx in unknown])
+            for idx, duration in zip(unknown, probed):
+                durations[idx] = duration
+
+    videos = []
+    shorts_filtered = 0
+    for entry, duration in zip(entries, durations):
+        if duration is None:
+            print(f"  Skipping video with unknown duration: {entry.get('title', 'Unknown')}")
+            continue
+
+        # Filter out YouTube Shorts (videos 60 seconds or less)
+        if duration <= 60:
+            shorts_filtered += 1
+            print(f"  Skipping Short: {entry.get('title', 'Unknown')} ({duration}s)")
+            continue
+
+        # yt-dlp already gives us plain strings here, so skip pydantic validation
+        videos.append(VideoMetadata.model_construct(
+            id=entry['id'],
+            title=entry.get('title', 'Unknown'),
+            url=f"https://www.youtube.com/watch?v={entry['id']}"
+        ))
+
+    if shorts_filtered > 0:
+        print(f"  Filtered out {shorts_filtered} Shorts")
+
+    return videos
+
+
+def iter_channel_video_pages(
+    channel_url: str,
+    page_size: int = LISTING_PAGE_SIZE,
+    max_entries: int = MAX_LISTING_ENTRIES
+) -> Iterator[List[VideoMetadata]]:
+    """Lazily yield pages of channel videos, newest first. Filters out YouTube Shorts."""
     # Append /videos to get the video feed
     if not channel_url.endswith('/videos'):
         channel_url = f"{channel_url}/videos"
@@ -81,89 +189,161 @@ def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetad
 
     ydl_opts = {
         'quiet': True,
-        'extract_flat': False,  # Need full info to get duration
-        'playlistend': max_videos * 5,  # Fetch more to account for shorts we'll filter out
+        # Flat entries come from the listing page itself and usually carry the duration
+        'extract_flat': 'in_playlist',
         'skip_download': True,
     }
 
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            playlist_info = ydl.extract_info(channel_url, download=False)
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        try:
+            # Unprocessed, the entries stay a lazy stream: each continuation page is fetched
+            # once, when iteration reaches it, so pages are cut from it here instead of
+            # re-listing the channel from the start for every window
+            playlist_info = ydl.extract_info(channel_url, download=False, process=False)
+        except Exception as e:
+            print(f"Error fetching channel videos: {e}")
+            return
 
-            if 'entries' not in playlist_info:
-                return []
+        entries = islice(playlist_info.get('entries') or [], max_entries)
 
-            videos = []
-            shorts_filtered = 0
-            for entry in playlist_info['entries']:
-                if entry is None:
-                    continue
+        while True:
+            try:
+                raw_page = list(islice(entries, page_size))
+            except Exception as e:
+                print(f"Error fetching channel videos: {e}")
+                return
 
-                # Filter out YouTube Shorts (videos 60 seconds or less)
-                duration = entry.get('duration', 0)
-                if duration <= 60:
-                    shorts_filtered += 1
-                    print(f"  Skipping Short: {entry.get('title', 'Unknown')} ({duration}s)")
-                    continue
+            page = [entry for entry in raw_page if entry is not None]
+            if page:
+                yield build_listing_page(page)
 
-                videos.append(VideoMetadata(
-                    id=entry['id'],
-                    title=entry.get('title', 'Unknown'),
-                    url=f"https://www.youtube.com/watch?v={entry['id']}"
-                ))
+            # A short page means the end of the channel listing
+            if len(raw_page) < page_size:
+                return
 
-                if len(videos) >= max_videos:
-                    break
 
-            if shorts_filtered > 0:
-                print(f"  Filtered out {shorts_filtered} Shorts")
+def get_channel_cache_file(channel_url: str) -> Path:
+    """Get the path of a channel's cached listing."""
+    url_hash = hashlib.sha1(channel_url.encode('utf-8')).hexdigest()[:16]
+    return OUTPUT_DIR / ".cache" / "channels" / f"{url_hash}.json"
 
-            return videos
 
-    except Exception as e:
-        print(f"Error fetching channel videos: {e}")
-        return []
+def load_cached_channel_videos(channel_url: str, max_videos: int) -> Optional[List[VideoMetadata]]:
+    """Return a fresh enough cached listing with at least max_videos entries, or None."""
+    if REFRESH_CHANNEL_CACHE:
+        return None
+
+    try:
+        cached = orjson.loads(get_channel_cache_file(channel_url).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
 
+    if time.time() - cached['fetched_at'] >= CHANNEL_CACHE_TTL_SECONDS or cached['max_videos'] < max_videos:
+        return None
+
+    return [VideoMetadata.model_construct(**video) for video in cached['videos'][:max_videos]]
+
+
+def store_cached_channel_videos(channel_url: str, max_videos: int, videos: List[VideoMetadata]) -> None:
+    """Cache a channel listing on disk."""
+    cache_file = get_channel_cache_file(channel_url)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(orjson.dumps({
+            'fetched_at': time.time(),
+            'max_videos': max_videos,
+            'videos': [video.model_dump() for video in videos]
+        }))
+    except OSError as e:
+        print(f"  Warning: Could not cache channel listing: {e}")
 
-def download_video_audio(video_url: str, creator_dir: Path) -> Optional[DownloadedVideo]:
-    """Download audio from a YouTube video."""
-    print(f"  Downloading: {video_url}")
 
+def get_channel_videos(channel_url: str, max_videos: int = 5) -> List[VideoMetadata]:
+    """Fetch video metadata from a channel without downloading. Filters out YouTube Shorts."""
+    cached_videos = load_cached_channel_videos(channel_url, max_videos)
+    if cached_videos is not None:
+        print(f"Using cached listing for: {channel_url}")
+        return cached_videos
+
+    videos = []
+    for page in iter_channel_video_pages(channel_url):
+        videos.extend(page)
+        if len(videos) >= max_videos:
+            break
+
+    videos = videos[:max_videos]
+    # An empty result may be a failed fetch, so don't cache it
+    if videos:
+        store_cached_channel_videos(channel_url, max_videos, videos)
+    return videos
+
+
+def build_download_opts(creator_dir: Path) -> Dict:
+    """Build the yt-dlp options for downloading audio into a creator directory."""
     ydl_opts = {
         'format': 'bestaudio[ext=m4a]/bestaudio',
         'outtmpl': str(creator_dir / '%(id)s.%(ext)s'),
         'quiet': False,
-        'writeinfojson': True,
-        'writethumbnail': True,
+        'writeinfojson': SAVE_METADATA,
+        'writethumbnail': SAVE_METADATA,
+        # Whisper resamples to 16 kHz mono anyway, so smaller files upload faster and rarely need chunking
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': TRANSCODE_BITRATE_KBPS,
+        }] if TRANSCODE_AUDIO else [],
+        'postprocessor_args': {'extractaudio': ['-ac', '1', '-ar', '16000']},
     }
 
+    return ydl_opts
+
+
+def get_audio_downloader(creator_dir: Path) -> yt_dlp.YoutubeDL:
+    """Get this thread's downloader for a creator directory, creating it on first use."""
+    # Reusing the instance keeps extractors initialised and HTTP connections open across videos
+    downloaders = getattr(_thread_local, "downloaders", None)
+    if downloaders is None:
+        downloaders = _thread_local.downloaders = {}
+
+    ydl = downloaders.get(creator_dir)
+    if ydl is None:
+        ydl = downloaders[creator_dir] = yt_dlp.YoutubeDL(build_download_opts(creator_dir))
+    return ydl
+
+
+def download_video_audio(video_url: str, creator_dir: Path) -> Optional[DownloadedVideo]:
+    """Download audio from a YouTube video."""
+    print(f"  Downloading: {video_url}")
+
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=True)
+        info = get_audio_downloader(creator_dir).extract_info(video_url, download=True)
+
+        # yt-dlp reports where it wrote the audio; only scan extensions if it didn't
+        requested_downloads = info.get('requested_downloads') or [{}]
+        audio_file = requested_downloads[0].get('filepath')
 
-            # Find the downloaded audio file
-            audio_file = None
+        if not audio_file or not os.path.exists(audio_file):
             for ext in ['m4a', 'mp3', 'webm']:
                 file_path = creator_dir / f"{info['id']}.{ext}"
                 if file_path.exists():
                     audio_file = str(file_path)
                     break
 
-            if not audio_file:
-                print(f"  Warning: Could not find audio file")
-                return None
+        if not audio_file:
+            print(f"  Warning: Could not find audio file")
+            return None
 
-            thumbnail_path = creator_dir / f"{info['id']}.jpg"
+        thumbnail_path = creator_dir / f"{info['id']}.jpg"
 
-            return DownloadedVideo(
-                video_id=info['id'],
-                title=info['title'],
-                url=info['webpage_url'],
-                duration=info.get('duration', 0),
-                upload_date=info.get('upload_date'),
-                audio_file=audio_file,
-                thumbnail=str(thumbnail_path) if thumbnail_path.exists() else None
-            )
+        return DownloadedVideo(
+            video_id=info['id'],
+            title=info['title'],
+            url=info['webpage_url'],
+            duration=info.get('duration', 0),
+            upload_date=info.get('upload_date'),
+            audio_file=audio_file,
+            thumbnail=str(thumbnail_path) if SAVE_METADATA and thumbnail_path.exists() else None
+        )
 
     except Exception as e:
         print(f"  Error downloading video: {e}")
@@ -171,13 +351,60 @@ def download_video_audio(video_url: str, creator_dir: Path) -> Optional[Download
 
 
 # Transcription utilities
+class RateLimiter:
+    """Limit requests per rolling minute and requests in flight, shared across threads."""
+
+    def __init__(self, rpm: int, concurrency: int):
+        self.rpm = rpm
+        self._slots = threading.Semaphore(concurrency)
+        self._lock = threading.Lock()
+        self._sent = deque()
+
+    def __enter__(self) -> "RateLimiter":
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    while self._sent and now - self._sent[0] >= 60:
+                        self._sent.popleft()
+                    if len(self._sent) < self.rpm:
+                        self._sent.append(now)
+                        return self
+                    wait = 60 - (now - self._sent[0])
+                time.sleep(wait)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        self._slots.release()
+
+
+# Every Whisper call from any creator, video or chunk thread goes through this
+WHISPER_RATE_LIMITER = RateLimiter(WHISPER_RPM, WHISPER_CONCURRENCY)
+
+
 def create_openai_client(api_key: str) -> OpenAI:
-    """Create OpenAI client."""
-    return OpenAI(api_key=api_key)
+    """Create OpenAI client, shared by all worker threads."""
+    # One HTTP/2 pool sized to the Whisper concurrency keeps TLS connections alive across chunks and videos
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=WHISPER_CONCURRENCY, max_keepalive_connections=WHISPER_CONCURRENCY),
+        timeout=WHISPER_TIMEOUT_SECONDS
+    )
+    return OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, http_client=http_client)
 
 
 def get_audio_duration(audio_file: str) -> float:
-    """Get duration of audio file in seconds using ffprobe."""
+    """Get duration of audio file in seconds from the container header, falling back to ffprobe."""
+    try:
+        with av.open(audio_file) as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except Exception as e:
+        print(f"  Could not read duration from container header: {e}")
+
     try:
         result = subprocess.run(
             [
@@ -197,53 +424,115 @@ def get_audio_duration(audio_file: str) -> float:
         return 0
 
 
-def split_audio_file(audio_file: str, chunk_duration_minutes: int = 20) -> List[str]:
-    """Split audio file into chunks of specified duration."""
+def split_audio_stream_copy(audio_file: str, chunk_duration_seconds: int) -> List[str]:
+    """Split audio into chunks in-process by copying packets with PyAV, without re-encoding."""
     audio_path = Path(audio_file)
-    file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+    chunks = []
 
-    print(f"  Audio file size: {file_size_mb:.2f} MB")
+    with av.open(audio_file) as source:
+        in_stream = source.streams.audio[0]
+        output = None
+        out_stream = None
+        chunk_start_pts = 0
 
-    if file_size_mb <= MAX_AUDIO_SIZE_MB:
-        return [audio_file]
+        try:
+            for packet in source.demux(in_stream):
+                # Flush packets carry no data and no timestamps
+                if packet.dts is None or packet.pts is None:
+                    continue
 
-    print(f"  File exceeds {MAX_AUDIO_SIZE_MB} MB limit. Splitting into chunks...")
+                position = float(packet.pts * in_stream.time_base)
+                if output is None or position >= len(chunks) * chunk_duration_seconds:
+                    if output is not None:
+                        output.close()
+                    chunk_file = audio_path.parent / f"{audio_path.stem}_chunk_{len(chunks):03d}{audio_path.suffix}"
+                    output = av.open(str(chunk_file), 'w')
+                    out_stream = output.add_stream_from_template(in_stream)
+                    chunk_start_pts = packet.pts
+                    chunks.append(str(chunk_file))
+
+                # Restart timestamps at zero in every chunk
+                packet.pts -= chunk_start_pts
+                packet.dts -= chunk_start_pts
+                packet.stream = out_stream
+                output.mux(packet)
+        except Exception:
+            # Don't leave partial chunks behind for the ffmpeg fallback to pick up
+            if output is not None:
+                output.close()
+                output = None
+            for chunk_file in chunks:
+                Path(chunk_file).unlink(missing_ok=True)
+            raise
+        finally:
+            if output is not None:
+                output.close()
+
+    return chunks
+
+
+def split_audio_file_ffmpeg(audio_file: str, chunk_duration_seconds: int) -> List[str]:
+    """Split audio into chunks with a single ffmpeg segment-muxer pass."""
+    audio_path = Path(audio_file)
 
-    duration = get_audio_duration(audio_file)
-    if duration == 0:
+    # One pass with the segment muxer writes every chunk, instead of re-reading the file per chunk
+    chunk_pattern = audio_path.parent / f"{audio_path.stem}_chunk_%03d{audio_path.suffix}"
+    try:
+        subprocess.run(
+            [
+                'ffmpeg',
+                '-i', audio_file,
+                '-f', 'segment',
+                '-segment_time', str(chunk_duration_seconds),
+                '-reset_timestamps', '1',
+                '-c', 'copy',
+                '-y',
+                str(chunk_pattern)
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True
+        )
+    except Exception as e:
+        print(f"  Error splitting audio: {e}")
+        return []
+
+    return [
+        str(chunk_file)
+        for chunk_file in sorted(audio_path.parent.glob(f"{audio_path.stem}_chunk_[0-9][0-9][0-9]{audio_path.suffix}"))
+    ]
+
+
+def split_audio_file(
+    audio_file: str,
+    chunk_duration_minutes: int = 20,
+    duration: Optional[float] = None
+) -> List[str]:
+    """Split audio file into chunks of specified duration. Probes the duration only if it isn't known."""
+    if not duration:
+        duration = get_audio_duration(audio_file)
+    if not duration:
         print("  Warning: Could not determine audio duration")
         return [audio_file]
 
     chunk_duration_seconds = chunk_duration_minutes * 60
-    num_chunks = int(duration / chunk_duration_seconds) + 1
 
     print(f"  Total duration: {duration/60:.1f} minutes")
-    print(f"  Creating {num_chunks} chunks of ~{chunk_duration_minutes} minutes each")
+    print(f"  Creating chunks of ~{chunk_duration_minutes} minutes each")
 
+    # Copy packets into chunks in-process; fall back to one ffmpeg segment-muxer pass
     chunks = []
-    for i in range(num_chunks):
-        start_time = i * chunk_duration_seconds
-        chunk_file = audio_path.parent / f"{audio_path.stem}_chunk_{i+1}{audio_path.suffix}"
+    try:
+        chunks = split_audio_stream_copy(audio_file, chunk_duration_seconds)
+    except Exception as e:
+        print(f"  Could not split audio in-process, using ffmpeg: {e}")
 
-        try:
-            subprocess.run(
-                [
-                    'ffmpeg',
-                    '-i', audio_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration_seconds),
-                    '-c', 'copy',
-                    '-y',
-                    str(chunk_file)
-                ],
-                capture_output=True,
-                check=True
-            )
-            chunks.append(str(chunk_file))
-            chunk_size_mb = chunk_file.stat().st_size / (1024 * 1024)
-            print(f"  Created chunk {i+1}/{num_chunks}: {chunk_size_mb:.2f} MB")
-        except Exception as e:
-            print(f"  Error creating chunk {i+1}: {e}")
+    if not chunks:
+        chunks = split_audio_file_ffmpeg(audio_file, chunk_duration_seconds)
+
+    for i, chunk_file in enumerate(chunks, 1):
+        chunk_size_mb = Path(chunk_file).stat().st_size / (1024 * 1024)
+        print(f"  Created chunk {i}/{len(chunks)}: {chunk_size_mb:.2f} MB")
 
     return chunks if chunks else [audio_file]
 
@@ -251,18 +540,27 @@ def split_audio_file(audio_file: str, chunk_duration_minutes: int = 20) -> List[
 def generate_transcript(
     audio_file: str,
     video_title: str,
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    delete_after_open: bool = False
 ) -> Optional[TranscriptData]:
     """Generate transcript using OpenAI Whisper."""
     print(f"  Transcribing: {video_title}")
 
     try:
-        with open(audio_file, 'rb') as audio:
+        with WHISPER_RATE_LIMITER, open(audio_file, 'rb') as audio:
+            if delete_after_open:
+                # The open handle keeps the data readable, retries included, until it closes;
+                # where open files can't be unlinked the caller deletes it afterwards
+                try:
+                    os.remove(audio_file)
+                except OSError:
+                    pass
+
             transcript = openai_client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio,
                 response_format="verbose_json",
-                timestamp_granularities=["segment", "word"]
+                timestamp_granularities=["segment", "word"] if WORD_TIMESTAMPS else ["segment"]
             )
 
         # Convert to dict
@@ -288,7 +586,6 @@ def merge_transcripts(chunk_transcripts: List[TranscriptData], chunk_duration_mi
     if len(chunk_transcripts) == 1:
         return chunk_transcripts[0]
 
-    merged_text = ""
     merged_segments = []
     merged_words = []
     total_duration = 0
@@ -297,30 +594,23 @@ def merge_transcripts(chunk_transcripts: List[TranscriptData], chunk_duration_mi
     for chunk_idx, chunk in enumerate(chunk_transcripts):
         time_offset = chunk_idx * chunk_duration_seconds
 
-        # Add text with space
-        if merged_text:
-            merged_text += " "
-        merged_text += chunk.text
-
-        # Adjust segment timestamps
+        # Adjust segment timestamps in place; chunk transcripts are discarded after merging
         for segment in chunk.segments:
-            adjusted_segment = segment.copy()
-            adjusted_segment['start'] = segment['start'] + time_offset
-            adjusted_segment['end'] = segment['end'] + time_offset
-            merged_segments.append(adjusted_segment)
+            segment['start'] += time_offset
+            segment['end'] += time_offset
+        merged_segments.extend(chunk.segments)
 
         # Adjust word timestamps if available
         if chunk.words:
             for word in chunk.words:
-                adjusted_word = word.copy()
-                adjusted_word['start'] = word['start'] + time_offset
-                adjusted_word['end'] = word['end'] + time_offset
-                merged_words.append(adjusted_word)
+                word['start'] += time_offset
+                word['end'] += time_offset
+            merged_words.extend(chunk.words)
 
         total_duration = max(total_duration, chunk.duration + time_offset)
 
     return TranscriptData(
-        text=merged_text,
+        text=" ".join(chunk.text for chunk in chunk_transcripts),
         language=chunk_transcripts[0].language,
         duration=total_duration,
         segments=merged_segments,
@@ -328,111 +618,181 @@ def merge_transcripts(chunk_transcripts: List[TranscriptData], chunk_duration_mi
     )
 
 
+def transcribe_chunk(
+    chunk_file: str,
+    chunk_idx: int,
+    total_chunks: int,
+    video_title: str,
+    openai_client: OpenAI
+) -> Optional[TranscriptData]:
+    """Transcribe one audio chunk, deleting its file as soon as the upload has it open."""
+    print(f"  Transcribing chunk {chunk_idx}/{total_chunks}...")
+    transcript = generate_transcript(
+        chunk_file,
+        f"{video_title} (chunk {chunk_idx})",
+        openai_client,
+        delete_after_open=True
+    )
+
+    if not transcript:
+        print(f"  Warning: Failed to transcribe chunk {chunk_idx}")
+
+    # Clean up chunk file if it wasn't already unlinked during the upload
+    try:
+        os.remove(chunk_file)
+        print(f"  Cleaned up chunk {chunk_idx}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"  Warning: Could not delete chunk file: {e}")
+
+    return transcript
+
+
 def generate_transcript_with_chunking(
     audio_file: str,
     video_title: str,
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    duration: Optional[float] = None
 ) -> Optional[TranscriptData]:
     """Generate transcript with automatic chunking for large files."""
-    # Split audio if needed
-    chunk_files = split_audio_file(audio_file, CHUNK_DURATION_MINUTES)
+    # Files under the Whisper limit go straight to transcription; a stat is all it takes
+    file_size_mb = os.path.getsize(audio_file) / (1024 * 1024)
+    if file_size_mb <= MAX_AUDIO_SIZE_MB:
+        return generate_transcript(audio_file, video_title, openai_client)
+
+    print(f"  Audio file is {file_size_mb:.2f} MB, exceeding the {MAX_AUDIO_SIZE_MB} MB limit. Splitting into chunks...")
+    chunk_files = split_audio_file(audio_file, CHUNK_DURATION_MINUTES, duration)
 
     if len(chunk_files) == 1:
-        # Single file, use normal transcription
+        # Splitting failed, so try the whole file
         return generate_transcript(audio_file, video_title, openai_client)
 
-    # Multiple chunks - transcribe each
+    # Multiple chunks - transcribe them concurrently
     print(f"  Transcribing {len(chunk_files)} chunks for: {video_title}")
-    chunk_transcripts = []
-
-    for idx, chunk_file in enumerate(chunk_files, 1):
-        print(f"  Transcribing chunk {idx}/{len(chunk_files)}...")
-        transcript = generate_transcript(chunk_file, f"{video_title} (chunk {idx})", openai_client)
-
-        if transcript:
-            chunk_transcripts.append(transcript)
-        else:
-            print(f"  Warning: Failed to transcribe chunk {idx}")
 
-        # Clean up chunk file
-        try:
-            if chunk_file != audio_file:  # Don't delete original
-                os.remove(chunk_file)
-                print(f"  Cleaned up chunk {idx}")
-        except Exception as e:
-            print(f"  Warning: Could not delete chunk file: {e}")
-
-    if not chunk_transcripts:
-        print("  Error: No chunks were successfully transcribed")
+    with ThreadPoolExecutor(max_workers=CHUNK_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                transcribe_chunk,
+                chunk_file,
+                idx,
+                len(chunk_files),
+                video_title,
+                openai_client
+            )
+            for idx, chunk_file in enumerate(chunk_files, 1)
+        ]
+        # Keep chunk order; merge_transcripts offsets timestamps by position
+        results = [future.result() for future in futures]
+
+    # Dropping a failed chunk would shift every later chunk back and leave a gap, so fail the video;
+    # the source audio is kept and the video is retried on the next run
+    failed_chunks = sum(1 for transcript in results if not transcript)
+    if failed_chunks:
+        print(f"  Error: {failed_chunks}/{len(results)} chunks failed to transcribe")
         return None
 
     # Merge all transcripts
-    print(f"  Merging {len(chunk_transcripts)} transcript chunks...")
-    merged = merge_transcripts(chunk_transcripts, CHUNK_DURATION_MINUTES)
+    print(f"  Merging {len(results)} transcript chunks...")
+    merged = merge_transcripts(results, CHUNK_DURATION_MINUTES)
     print(f"  Merge complete! Total duration: {merged.duration/60:.1f} minutes")
 
     return merged
 
 
 # File I/O utilities
-def save_transcript_json(
-    transcript: TranscriptData,
-    video_info: DownloadedVideo,
-    creator_dir: Path
-) -> str:
-    """Save transcript to JSON file."""
-    transcripts_dir = creator_dir / "transcripts"
-    transcripts_dir.mkdir(exist_ok=True)
-
-    json_file = transcripts_dir / f"{video_info.video_id}_transcript.json"
-
-    transcript_data = {
+def build_transcript_metadata(video_info: DownloadedVideo) -> Dict:
+    """Build the video fields of a transcript record."""
+    return {
         'video_id': video_info.video_id,
         'title': video_info.title,
         'url': video_info.url,
         'duration': video_info.duration,
-        'upload_date': video_info.upload_date,
-        'transcript': transcript.dict()
+        'upload_date': video_info.upload_date
     }
 
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(transcript_data, f, indent=2, ensure_ascii=False)
 
-    print(f"  Saved transcript: {json_file}")
-    return str(json_file)
+def build_transcript_record(transcript: TranscriptData, video_info: DownloadedVideo) -> Dict:
+    """Build the transcript record that is ingested into RAG."""
+    record = build_transcript_metadata(video_info)
+    # Shallow field view; segments and words are shared with the model, not copied
+    record['transcript'] = dict(transcript)
+    return record
+
+
+def build_transcript_json(transcript: TranscriptData, video_info: DownloadedVideo) -> bytes:
+    """Serialize the transcript record to JSON bytes."""
+    # Serialize the transcript straight from the model instead of dumping it to a dict first
+    metadata_json = orjson.dumps(build_transcript_metadata(video_info))
+    return metadata_json[:-1] + b', "transcript": ' + transcript.model_dump_json().encode('utf-8') + b'}'
+
+
+def build_readable_transcript(transcript: TranscriptData, video_info: DownloadedVideo) -> str:
+    """Build a human-readable text version of the transcript."""
+    header = (
+        f"Video: {video_info.title}\n"
+        f"URL: {video_info.url}\n"
+        f"Duration: {video_info.duration / 60:.1f} minutes\n"
+        + "="*80 + "\n\n"
+    )
+
+    lines = [
+        f"[{int(segment.get('start', 0) // 60):02d}:{int(segment.get('start', 0) % 60):02d}] "
+        f"{segment.get('text', '').strip()}\n\n"
+        for segment in transcript.segments
+    ]
+    return header + "".join(lines)
 
 
-def create_readable_transcript(
+def write_transcript_artifacts(
     transcript: TranscriptData,
     video_info: DownloadedVideo,
-    creator_dir: Path
-) -> None:
-    """Create a human-readable text version of the transcript."""
+    creator_dir: Path,
+    write_readable: bool = True
+) -> str:
+    """Write the zstd-compressed JSON transcript and, optionally, its readable text version."""
     transcripts_dir = creator_dir / "transcripts"
-    txt_file = transcripts_dir / f"{video_info.video_id}_readable.txt"
+    transcripts_dir.mkdir(exist_ok=True)
 
-    with open(txt_file, 'w', encoding='utf-8') as f:
-        f.write(f"Video: {video_info.title}\n")
-        f.write(f"URL: {video_info.url}\n")
-        f.write(f"Duration: {video_info.duration / 60:.1f} minutes\n")
-        f.write("="*80 + "\n\n")
+    json_file = transcripts_dir / f"{video_info.video_id}_transcript.json.zst"
+    with open(json_file, 'wb') as f:
+        f.write(zstd.ZstdCompressor(level=TRANSCRIPT_ZSTD_LEVEL).compress(
+            build_transcript_json(transcript, video_info)
+        ))
+    print(f"  Saved transcript: {json_file}")
 
-        for segment in transcript.segments:
-            start = segment.get('start', 0)
-            minutes = int(start // 60)
-            seconds = int(start % 60)
-            timestamp = f"[{minutes:02d}:{seconds:02d}]"
-            text = segment.get('text', '').strip()
-            f.write(f"{timestamp} {text}\n\n")
+    if write_readable:
+        txt_file = transcripts_dir / f"{video_info.video_id}_readable.txt"
+        txt_file.write_text(build_readable_transcript(transcript, video_info), encoding='utf-8')
+        print(f"  Saved readable transcript: {txt_file}")
 
-    print(f"  Saved readable transcript: {txt_file}")
+    return str(json_file)
 
 
 def cleanup_audio_file(audio_file: str) -> None:
     """Remove audio file to save space."""
-    if os.path.exists(audio_file):
+    try:
         os.remove(audio_file)
         print(f"  Cleaned up audio file")
+    except FileNotFoundError:
+        pass
+
+
+def get_transcribed_video_ids(creator_dir: Path) -> Set[str]:
+    """Get IDs of videos that already have a non-empty transcript JSON on disk."""
+    transcripts_dir = creator_dir / "transcripts"
+    if not transcripts_dir.is_dir():
+        return set()
+
+    # Older runs wrote plain .json, newer ones write .json.zst
+    video_ids = set()
+    for suffix in ("_transcript.json", "_transcript.json.zst"):
+        for path in transcripts_dir.glob(f"*{suffix}"):
+            if path.stat().st_size > 0:
+                video_ids.add(path.name[:-len(suffix)])
+
+    return video_ids
 
 
 # Processing workflows
@@ -442,6 +802,14 @@ def process_single_video(
     openai_client: OpenAI
 ) -> bool:
     """Process a single video: download, transcribe, save."""
+    # Skip videos transcribed by an earlier run
+    transcripts_dir = creator_dir / "transcripts"
+    for suffix in ("_transcript.json.zst", "_transcript.json"):
+        transcript_file = transcripts_dir / f"{video.id}{suffix}"
+        if transcript_file.exists() and transcript_file.stat().st_size > 0:
+            print(f"  Already transcribed, skipping: {video.title}")
+            return True
+
     # Download video
     video_info = download_video_audio(video.url, creator_dir)
     if not video_info:
@@ -451,14 +819,14 @@ def process_single_video(
     transcript = generate_transcript_with_chunking(
         video_info.audio_file,
         video_info.title,
-        openai_client
+        openai_client,
+        video_info.duration  # Known from yt-dlp, so no probe is needed
     )
     if not transcript:
         return False
 
     # Save transcript files
-    save_transcript_json(transcript, video_info, creator_dir)
-    create_readable_transcript(transcript, video_info, creator_dir)
+    write_transcript_artifacts(transcript, video_info, creator_dir)
 
     # Clean up audio file
     cleanup_audio_file(video_info.audio_file)
@@ -487,12 +855,29 @@ def process_creator(
     videos = get_channel_videos(creator_info['url'], max_videos)
     print(f"Found {len(videos)} videos")
 
-    processed_count = 0
-    for idx, video in enumerate(videos, 1):
-        print(f"\nVideo {idx}/{len(videos)}: {video.title}")
-
-        if process_single_video(video, creator_dir, openai_client):
-            processed_count += 1
+    # Drop videos with a transcript on disk before any yt-dlp work is queued
+    transcribed_ids = get_transcribed_video_ids(creator_dir)
+    already_done = sum(1 for video in videos if video.id in transcribed_ids)
+    if already_done:
+        print(f"Skipping {already_done} already transcribed videos")
+        pending_videos = [video for video in videos if video.id not in transcribed_ids]
+    else:
+        pending_videos = videos
+
+    # Downloads and Whisper calls are network-bound, so overlap them across videos
+    processed_count = already_done
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for idx, video in enumerate(pending_videos, 1):
+            print(f"\nVideo {idx}/{len(pending_videos)}: {video.title}")
+            futures[executor.submit(process_single_video, video, creator_dir, openai_client)] = video
+
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    processed_count += 1
+            except Exception as e:
+                print(f"Error processing {futures[future].title}: {e}")
 
     print(f"\nProcessed {processed_count}/{len(videos)} videos for {creator_name}")
     return processed_count
@@ -511,32 +896,46 @@ def process_all_creators(
 
     openai_client = create_openai_client(openai_api_key)
 
-    summary = ProcessingSummary(
-        total_creators=len(creators),
-        total_videos_processed=0,
-        creators_processed={},
-        timestamp=datetime.now().isoformat()
-    )
+    started_at = datetime.now().isoformat()
+    creators_processed = {}
 
-    for creator_name, creator_info in creators.items():
-        try:
-            count = process_creator(
+    # Creators are independent, so process them concurrently; results are only
+    # collected from this thread as they complete
+    with ThreadPoolExecutor(max_workers=max(len(creators), 1)) as executor:
+        futures = {
+            executor.submit(
+                process_creator,
                 creator_name,
                 creator_info,
                 output_dir,
                 openai_client,
                 max_videos_per_creator
-            )
-            summary.creators_processed[creator_name] = count
-            summary.total_videos_processed += count
-        except Exception as e:
-            print(f"Error processing {creator_name}: {e}")
-            summary.creators_processed[creator_name] = 0
+            ): creator_name
+            for creator_name, creator_info in creators.items()
+        }
+
+        for future in as_completed(futures):
+            creator_name = futures[future]
+            try:
+                creators_processed[creator_name] = future.result()
+            except Exception as e:
+                print(f"Error processing {creator_name}: {e}")
+                creators_processed[creator_name] = 0
+
+    # We passed in the HTTP/2 pool, so the SDK won't close it on its own
+    openai_client.close()
+
+    summary = ProcessingSummary(
+        total_creators=len(creators),
+        total_videos_processed=sum(creators_processed.values()),
+        creators_processed=creators_processed,
+        timestamp=started_at
+    )
 
     # Save summary
     summary_file = output_dir / "processing_summary.json"
-    with open(summary_file, 'w') as f:
-        json.dump(summary.dict(), f, indent=2)
+    with open(summary_file, 'wb') as f:
+        f.write(orjson.dumps(summary.model_dump(), option=orjson.OPT_INDENT_2))
 
     print(f"\n{'='*80}")
     print("PROCESSING COMPLETE")